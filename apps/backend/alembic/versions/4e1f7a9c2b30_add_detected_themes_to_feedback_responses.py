@@ -0,0 +1,37 @@
+"""Add detected_themes to feedback_responses
+
+Revision ID: 4e1f7a9c2b30
+Revises: cbc68128c1aa
+Create Date: 2025-10-20 10:12:31.418207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4e1f7a9c2b30'
+down_revision: Union[str, Sequence[str], None] = 'cbc68128c1aa'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - store improvement themes detected at ingest."""
+    op.add_column(
+        'feedback_responses',
+        sa.Column(
+            'detected_themes',
+            postgresql.ARRAY(sa.String(length=50)),
+            nullable=True,
+            comment='Our analysis: improvement themes detected at ingest (NULL for rows synced before themes were stored)'
+        )
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema - drop stored improvement themes."""
+    op.drop_column('feedback_responses', 'detected_themes')
@@ -0,0 +1,55 @@
+"""Add indexes for course aggregates, submission listings, and legacy theme scans
+
+Revision ID: 9d2c5e8a1f47
+Revises: 4e1f7a9c2b30
+Create Date: 2025-10-22 09:41:07.532118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d2c5e8a1f47'
+down_revision: Union[str, Sequence[str], None] = '4e1f7a9c2b30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - add composite and partial indexes used by feedback queries."""
+    # Per-course count/max(finished_at)/max(processed_at) and recent submissions
+    op.create_index(
+        'idx_student_feedback_course_finished',
+        'student_feedback',
+        ['course_id', 'finished_at', 'processed_at'],
+        unique=False
+    )
+    # Per-survey submission listing ordered by finished_at
+    op.create_index(
+        'idx_student_feedback_survey_finished',
+        'student_feedback',
+        ['canvas_survey_id', 'finished_at'],
+        unique=False
+    )
+    # Only text responses synced before detected_themes was stored
+    op.create_index(
+        'idx_feedback_responses_legacy_themes',
+        'feedback_responses',
+        ['student_feedback_id'],
+        unique=False,
+        postgresql_where=sa.text('detected_themes IS NULL AND response_text IS NOT NULL')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema - drop feedback query indexes."""
+    op.drop_index(
+        'idx_feedback_responses_legacy_themes',
+        table_name='feedback_responses',
+        postgresql_where=sa.text('detected_themes IS NULL AND response_text IS NOT NULL')
+    )
+    op.drop_index('idx_student_feedback_survey_finished', table_name='student_feedback')
+    op.drop_index('idx_student_feedback_course_finished', table_name='student_feedback')
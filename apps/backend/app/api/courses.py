@@ -4,9 +4,9 @@ Canvas Course API Endpoints
 Provides endpoints for syncing and retrieving Canvas courses.
 """
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
+from sqlalchemy import select, update, func
 from sqlalchemy.dialects.postgresql import insert
 from datetime import datetime
 from dateutil import parser as date_parser
@@ -15,6 +15,7 @@ from app.core.database import get_db
 from app.core.config import get_settings, Settings
 from app.models.course import Course
 from app.schemas.course import CourseResponse, CourseListResponse
+from app.services.canvas.base import get_canvas_http_client
 import httpx
 
 router = APIRouter(prefix="/courses", tags=["courses"])
@@ -45,34 +46,35 @@ async def fetch_canvas_courses(settings: Settings) -> List[dict]:
         "include[]": ["total_students", "term"]
     }
 
-    async with httpx.AsyncClient(timeout=settings.CANVAS_API_TIMEOUT) as client:
-        while url:
-            response = await client.get(
-                url,
-                headers=settings.canvas_headers,
-                params=params if url == f"{settings.CANVAS_BASE_URL}/api/v1/accounts/{settings.CANVAS_ACCOUNT_ID}/courses" else None
-            )
+    # Reuse the pooled Canvas client so keep-alive connections survive across syncs
+    client = get_canvas_http_client()
+    while url:
+        response = await client.get(
+            url,
+            headers=settings.canvas_headers,
+            params=params if url == f"{settings.CANVAS_BASE_URL}/api/v1/accounts/{settings.CANVAS_ACCOUNT_ID}/courses" else None
+        )
 
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=status.HTTP_502_BAD_GATEWAY,
-                    detail=f"Canvas API error: {response.status_code}"
-                )
+        if response.status_code != 200:
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail=f"Canvas API error: {response.status_code}"
+            )
 
-            page_courses = response.json()
-            courses.extend(page_courses)
+        page_courses = response.json()
+        courses.extend(page_courses)
 
-            # Parse Link header for next page
-            link_header = response.headers.get("Link", "")
-            next_url = None
+        # Parse Link header for next page
+        link_header = response.headers.get("Link", "")
+        next_url = None
 
-            for link in link_header.split(","):
-                if 'rel="next"' in link:
-                    next_url = link[link.find("<") + 1:link.find(">")]
-                    break
+        for link in link_header.split(","):
+            if 'rel="next"' in link:
+                next_url = link[link.find("<") + 1:link.find(">")]
+                break
 
-            url = next_url
-            params = None  # Don't send params for subsequent requests
+        url = next_url
+        params = None  # Don't send params for subsequent requests
 
     return courses
 
@@ -92,11 +94,12 @@ async def sync_canvas_courses(
         # Fetch courses from Canvas
         canvas_courses = await fetch_canvas_courses(settings)
 
-        synced_count = 0
-
+        # Parse Canvas course data, keyed by canvas_id so a course repeated
+        # across pages appears once (Postgres rejects an ON CONFLICT statement
+        # that updates the same row twice)
+        course_rows = {}
         for canvas_course in canvas_courses:
-            # Parse Canvas course data
-            course_data = {
+            course_rows[canvas_course["id"]] = {
                 "canvas_id": canvas_course["id"],
                 "name": canvas_course.get("name"),
                 "course_code": canvas_course.get("course_code"),
@@ -104,12 +107,15 @@ async def sync_canvas_courses(
                 "start_date": parse_canvas_date(canvas_course.get("start_at")),
                 "end_date": parse_canvas_date(canvas_course.get("end_at")),
                 "total_students": canvas_course.get("total_students", 0),
-                "enrollment_term_id": canvas_course.get("enrollment_term_id"),
-                "updated_at": datetime.utcnow()
+                "enrollment_term_id": canvas_course.get("enrollment_term_id")
             }
 
-            # Upsert course (insert or update if canvas_id exists)
-            stmt = insert(Course).values(**course_data)
+        # Upsert all courses (insert or update if canvas_id exists) in one
+        # executemany; SQLAlchemy batches the rows into multi-row statements.
+        # Timestamps come from the server: new rows use the column default,
+        # and ON CONFLICT skips Column.onupdate so updated_at is set here
+        if course_rows:
+            stmt = insert(Course)
             stmt = stmt.on_conflict_do_update(
                 index_elements=["canvas_id"],
                 set_={
@@ -120,14 +126,15 @@ async def sync_canvas_courses(
                     "end_date": stmt.excluded.end_date,
                     "total_students": stmt.excluded.total_students,
                     "enrollment_term_id": stmt.excluded.enrollment_term_id,
-                    "updated_at": stmt.excluded.updated_at
+                    "updated_at": func.now()
                 }
             )
 
-            await db.execute(stmt)
-            synced_count += 1
+            # One explicit transaction: commits on exit, rolls back on error
+            async with db.begin():
+                await db.execute(stmt, list(course_rows.values()))
 
-        await db.commit()
+        synced_count = len(course_rows)
 
         return {
             "status": "success",
@@ -164,10 +171,12 @@ async def get_courses(
         skip: Number of courses to skip (pagination)
         limit: Maximum number of courses to return
     """
-    query = select(Course).offset(skip).limit(limit)
+    # Plain column rows: the schema reads attributes straight off each Row,
+    # skipping ORM instance construction and the identity map
+    query = select(*Course.__table__.columns).offset(skip).limit(limit)
 
     result = await db.execute(query)
-    courses = result.scalars().all()
+    courses = result.all()
 
     # Convert to Pydantic models and filter if needed
     course_responses = [CourseResponse.model_validate(course) for course in courses]
@@ -175,17 +184,14 @@ async def get_courses(
     if active_only:
         course_responses = [c for c in course_responses if c.is_active]
 
-    # Get total count
-    count_query = select(Course)
-    count_result = await db.execute(count_query)
-    total = len(count_result.scalars().all())
-
-    return CourseListResponse(
+    # Already validated: encode directly instead of FastAPI's dump/re-validate pass
+    page = CourseListResponse(
         courses=course_responses,
         total=len(course_responses),
         skip=skip,
         limit=limit
     )
+    return Response(content=page.model_dump_json(), media_type="application/json")
 
 
 @router.get("/{course_id}", response_model=CourseResponse)
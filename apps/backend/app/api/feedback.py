@@ -4,10 +4,12 @@ Student Feedback API Endpoints
 Provides endpoints for syncing and retrieving student feedback from Canvas quiz submissions.
 Integrates response processing, categorization, and aggregation.
 """
+import logging
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update, func, exists
+from sqlalchemy.orm import load_only, selectinload
 from sqlalchemy.dialects.postgresql import insert
 from datetime import datetime
 from uuid import UUID
@@ -31,11 +33,30 @@ from app.schemas.feedback import (
 from app.services.canvas.submissions import CanvasSubmissionsClient
 from app.services.canvas.quizzes import CanvasQuizzesClient
 from app.services.canvas.reports import CanvasQuizReportsClient
-from app.services.response_processor import ResponseProcessor
-from app.services.feedback_aggregation import FeedbackAggregator
+from app.services.response_processor import get_response_processor
+from app.services.feedback_aggregation import FeedbackAggregator, invalidate_course_metrics
 
+logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/feedback", tags=["feedback"])
 
+# Columns served by StudentFeedbackResponse; list endpoints never send the
+# raw Canvas payload (raw_response_data), so it is not loaded for them
+SUBMISSION_LIST_COLUMNS = (
+    StudentFeedback.id,
+    StudentFeedback.canvas_survey_id,
+    StudentFeedback.course_id,
+    StudentFeedback.canvas_submission_id,
+    StudentFeedback.student_canvas_id,
+    StudentFeedback.started_at,
+    StudentFeedback.finished_at,
+    StudentFeedback.attempt,
+    StudentFeedback.score,
+    StudentFeedback.kept_score,
+    StudentFeedback.fudge_points,
+    StudentFeedback.workflow_state,
+    StudentFeedback.processed_at
+)
+
 
 @router.post("/sync/{survey_id}", status_code=status.HTTP_200_OK)
 async def sync_student_feedback(
@@ -61,32 +82,43 @@ async def sync_student_feedback(
     try:
         # Get survey from database
         survey_uuid = UUID(survey_id)
-        survey_query = select(CanvasSurvey).where(CanvasSurvey.id == survey_uuid)
-        survey_result = await db.execute(survey_query)
-        survey = survey_result.scalar_one_or_none()
+        # Survey and its course's IDs in one round-trip; the outer join keeps
+        # the survey row when its course is missing so both 404s still apply.
+        # Plain columns, so no ORM instances or selectin-loaded submissions
+        lookup_query = (
+            select(
+                CanvasSurvey.id.label("survey_db_id"),
+                CanvasSurvey.canvas_quiz_id,
+                Course.id.label("course_db_id"),
+                Course.canvas_id.label("course_canvas_id")
+            )
+            .outerjoin(Course, Course.id == CanvasSurvey.course_id)
+            .where(CanvasSurvey.id == survey_uuid)
+        )
+        lookup_result = await db.execute(lookup_query)
+        lookup = lookup_result.one_or_none()
 
-        if not survey:
+        if not lookup:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Survey with id {survey_id} not found"
             )
 
-        # Get course for Canvas IDs
-        course_query = select(Course).where(Course.id == survey.course_id)
-        course_result = await db.execute(course_query)
-        course = course_result.scalar_one_or_none()
-
-        if not course:
+        if lookup.course_db_id is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Course for survey {survey_id} not found"
             )
 
-        # Extract IDs as primitives to avoid SQLAlchemy lazy-loading issues
-        course_canvas_id = course.canvas_id
-        course_db_id = course.id
-        survey_canvas_quiz_id = survey.canvas_quiz_id
-        survey_db_id = survey.id
+        course_canvas_id = lookup.course_canvas_id
+        course_db_id = lookup.course_db_id
+        survey_canvas_quiz_id = lookup.canvas_quiz_id
+        survey_db_id = lookup.survey_db_id
+
+        # End the lookup transaction so no pooled connection sits idle in a
+        # transaction while Canvas responds; the writes below run in one
+        # transaction committed at the end
+        await db.commit()
 
         # Fetch quiz questions for metadata
         quizzes_client = CanvasQuizzesClient()
@@ -104,7 +136,7 @@ async def sync_student_feedback(
                 quiz_id=survey_canvas_quiz_id
             )
         except Exception as e:
-            print(f"Error fetching quiz reports: {e}")
+            logger.error("Error fetching quiz reports: %s", e)
             return FeedbackSyncResponse(
                 status="error",
                 survey_id=survey_db_id,
@@ -129,7 +161,8 @@ async def sync_student_feedback(
             )
 
         # Process each student's responses
-        processor = ResponseProcessor()
+        processor = get_response_processor()
+        question_index = processor.build_question_index(questions)
         submissions_stored = 0
         responses_parsed = 0
         critical_issues_detected = 0
@@ -138,7 +171,7 @@ async def sync_student_feedback(
             try:
                 # Parse CSV student response
                 submission_metadata, parsed_responses = processor.parse_csv_student_response(
-                    csv_student_data, questions
+                    csv_student_data, questions, question_index=question_index
                 )
 
                 # Store student feedback
@@ -148,50 +181,54 @@ async def sync_student_feedback(
                     **submission_metadata
                 }
 
-                # Upsert student feedback
-                # CSV data uses student_canvas_id for uniqueness (no canvas_submission_id available)
-                stmt = insert(StudentFeedback).values(**feedback_data)
-                stmt = stmt.on_conflict_do_update(
-                    index_elements=["canvas_survey_id", "student_canvas_id"],
-                    set_={
-                        "workflow_state": stmt.excluded.workflow_state,
-                        "raw_response_data": stmt.excluded.raw_response_data,
-                        "processed_at": datetime.utcnow()
-                    }
-                ).returning(StudentFeedback.id)
-
-                result = await db.execute(stmt)
-                student_feedback_id = result.scalar_one()
-                submissions_stored += 1
-
-                # Store individual responses
-                for response_data in parsed_responses:
-                    response_data["student_feedback_id"] = student_feedback_id
+                # Each student's writes run in a savepoint so a failing row
+                # rolls back only that student, not the whole sync
+                async with db.begin_nested():
+                    # Upsert student feedback
+                    # CSV data uses student_canvas_id for uniqueness (no canvas_submission_id available)
+                    stmt = insert(StudentFeedback).values(**feedback_data)
+                    stmt = stmt.on_conflict_do_update(
+                        index_elements=["canvas_survey_id", "student_canvas_id"],
+                        set_={
+                            "workflow_state": stmt.excluded.workflow_state,
+                            "raw_response_data": stmt.excluded.raw_response_data,
+                            "processed_at": func.now()
+                        }
+                    ).returning(StudentFeedback.id)
+
+                    result = await db.execute(stmt)
+                    student_feedback_id = result.scalar_one()
+
+                    # Insert the student's responses in one executemany;
+                    # SQLAlchemy batches them into multi-row INSERT statements
+                    for response_data in parsed_responses:
+                        response_data["student_feedback_id"] = student_feedback_id
+                    if parsed_responses:
+                        response_stmt = insert(FeedbackResponse).on_conflict_do_nothing()
+                        await db.execute(response_stmt, parsed_responses)
 
-                    # Upsert feedback response
-                    response_stmt = insert(FeedbackResponse).values(**response_data)
-                    response_stmt = response_stmt.on_conflict_do_nothing()
-                    await db.execute(response_stmt)
-                    responses_parsed += 1
-
-                    if response_data.get("is_critical_issue"):
-                        critical_issues_detected += 1
+                submissions_stored += 1
+                responses_parsed += len(parsed_responses)
+                critical_issues_detected += sum(
+                    1 for response_data in parsed_responses if response_data.get("is_critical_issue")
+                )
 
             except Exception as e:
                 student_id = csv_student_data.get('student_canvas_id', 'unknown')
-                print(f"Error processing CSV student response for student {student_id}: {e}")
+                logger.warning("Error processing CSV student response for student %s: %s", student_id, e)
                 continue
 
-        # Update survey response count using primitive update
+        # Update survey response count using primitive update (one UPDATE,
+        # no SELECT to load the survey first)
         update_stmt = (
-            select(CanvasSurvey)
+            update(CanvasSurvey)
             .where(CanvasSurvey.id == survey_db_id)
+            .values(response_count=submissions_stored, last_synced=datetime.utcnow())
         )
-        survey_to_update = (await db.execute(update_stmt)).scalar_one()
-        survey_to_update.response_count = submissions_stored
-        survey_to_update.last_synced = datetime.utcnow()
+        await db.execute(update_stmt)
 
         await db.commit()
+        invalidate_course_metrics(course_db_id)
 
         return FeedbackSyncResponse(
             status="success",
@@ -242,8 +279,27 @@ async def get_survey_feedback(
             detail="Invalid survey ID format"
         )
 
+    # The filtered total rides along on every page row, so the page and the
+    # count come back from one statement
+    total_count = func.count().over().label("total_count")
+
+    if include_responses:
+        # ORM rows so responses load for the whole page in one IN query
+        query = select(StudentFeedback, total_count).options(
+            load_only(*SUBMISSION_LIST_COLUMNS),
+            selectinload(StudentFeedback.responses)
+        )
+    else:
+        # Plain column rows; no ORM instances or relationship loading. The
+        # critical flag is an EXISTS per row so has_critical_issues stays accurate
+        has_critical_responses = exists().where(
+            FeedbackResponse.student_feedback_id == StudentFeedback.id,
+            FeedbackResponse.is_critical_issue.is_(True)
+        ).label("has_critical_responses")
+        query = select(*SUBMISSION_LIST_COLUMNS, has_critical_responses, total_count)
+
     query = (
-        select(StudentFeedback)
+        query
         .where(StudentFeedback.canvas_survey_id == survey_uuid)
         .offset(skip)
         .limit(limit)
@@ -251,36 +307,38 @@ async def get_survey_feedback(
     )
 
     result = await db.execute(query)
-    submissions = result.scalars().all()
-
-    # Get total count
-    count_query = select(StudentFeedback).where(
-        StudentFeedback.canvas_survey_id == survey_uuid
-    )
-    count_result = await db.execute(count_query)
-    total = len(count_result.scalars().all())
+    rows = result.all()
+    submissions = [row.StudentFeedback for row in rows] if include_responses else rows
+
+    if rows:
+        total = rows[0].total_count
+    elif skip:
+        # Page past the end carries no rows to read the total from
+        count_query = select(func.count()).select_from(StudentFeedback).where(
+            StudentFeedback.canvas_survey_id == survey_uuid
+        )
+        total = (await db.execute(count_query)).scalar_one()
+    else:
+        total = 0
 
     # Convert to response schemas
     submission_responses = []
     for submission in submissions:
-        response_data = StudentFeedbackResponse.model_validate(submission)
-
-        if include_responses:
-            # Load responses if requested
-            responses_query = select(FeedbackResponse).where(
-                FeedbackResponse.student_feedback_id == submission.id
-            )
-            responses_result = await db.execute(responses_query)
-            response_data.responses = responses_result.scalars().all()
-
-        submission_responses.append(response_data)
-
-    return StudentFeedbackList(
+        submission_response = StudentFeedbackResponse.model_validate(submission)
+        if not include_responses:
+            submission_response._has_critical_responses = submission.has_critical_responses
+        submission_responses.append(submission_response)
+
+    # Encode the validated page straight to JSON bytes; returning the model
+    # would have FastAPI dump it to a dict, re-validate that dict against
+    # response_model, and only then encode it
+    page = StudentFeedbackList(
         submissions=submission_responses,
         total=total,
         skip=skip,
         limit=limit
     )
+    return Response(content=page.model_dump_json(), media_type="application/json")
 
 
 @router.get("/courses/{course_id}/summary", response_model=CourseFeedbackSummary)
@@ -356,6 +414,7 @@ async def get_course_feedback_detail(
     if include_recent_submissions:
         recent_query = (
             select(StudentFeedback)
+            .options(load_only(*SUBMISSION_LIST_COLUMNS))
             .where(StudentFeedback.course_id == course_id)
             .order_by(StudentFeedback.finished_at.desc())
             .limit(recent_limit)
@@ -4,10 +4,13 @@ Canvas Quiz/Survey API Endpoints
 Provides endpoints for syncing and retrieving Canvas quizzes/surveys.
 Integrates with survey detection to identify feedback surveys.
 """
+import asyncio
+import logging
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func
+from sqlalchemy.orm import raiseload
 from sqlalchemy.dialects.postgresql import insert
 from datetime import datetime
 from decimal import Decimal
@@ -21,8 +24,12 @@ from app.schemas.quiz import CanvasSurveyResponse, CanvasSurveyList
 from app.services.canvas.quizzes import CanvasQuizzesClient
 from app.services.survey_detector import SurveyDetector
 
+logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/quizzes", tags=["quizzes"])
 
+# Max simultaneous Canvas quiz-list requests during an all-courses sync
+QUIZ_FETCH_CONCURRENCY = 10
+
 
 @router.post("/sync", status_code=status.HTTP_200_OK)
 async def sync_quizzes_for_all_courses(
@@ -35,7 +42,7 @@ async def sync_quizzes_for_all_courses(
 
     This endpoint:
     1. Fetches all courses from database
-    2. For each course, fetches quizzes from Canvas API
+    2. Fetches quizzes for all courses from Canvas API concurrently
     3. Uses survey detector to identify feedback surveys
     4. Stores identified surveys in database with confidence scores
 
@@ -53,10 +60,15 @@ async def sync_quizzes_for_all_courses(
         }
     """
     try:
-        # Get all active courses from database
-        courses_query = select(Course)
+        # Get all active courses from database (IDs as primitives so the
+        # per-course commits below don't expire them)
+        courses_query = select(Course.id, Course.canvas_id)
         courses_result = await db.execute(courses_query)
-        courses = courses_result.scalars().all()
+        courses = courses_result.all()
+
+        # End the lookup transaction before the Canvas fetches so the pooled
+        # connection is not held idle in a transaction during network I/O
+        await db.commit()
 
         if not courses:
             return {
@@ -72,25 +84,33 @@ async def sync_quizzes_for_all_courses(
         surveys_identified = 0
         high_confidence = 0
 
+        # Fetch quizzes for every course concurrently. Only the Canvas calls
+        # run in parallel: AsyncSession is not safe for concurrent use, so
+        # the database writes below stay sequential.
+        semaphore = asyncio.Semaphore(QUIZ_FETCH_CONCURRENCY)
+
+        async def fetch_quizzes(canvas_course_id: int):
+            async with semaphore:
+                return await quizzes_client.get_all_for_course(canvas_course_id)
+
+        course_quizzes = await asyncio.gather(
+            *(fetch_quizzes(course.canvas_id) for course in courses),
+            return_exceptions=True
+        )
+
         # Process each course
-        for course in courses:
+        for course, canvas_quizzes in zip(courses, course_quizzes):
             try:
-                # Fetch quizzes for this course from Canvas
-                canvas_quizzes = await quizzes_client.get_all_for_course(course.canvas_id)
+                if isinstance(canvas_quizzes, Exception):
+                    raise canvas_quizzes
+
                 total_quizzes += len(canvas_quizzes)
 
                 if not canvas_quizzes:
                     continue
 
-                # Identify surveys using detector
-                identified = detector.identify_batch(canvas_quizzes)
-
-                # Filter to surveys meeting confidence threshold
-                surveys = [
-                    q for q in identified
-                    if q['survey_detection']['is_survey'] and
-                    q['survey_detection']['confidence'] >= Decimal(str(min_confidence))
-                ]
+                # Identify surveys meeting confidence threshold
+                surveys = detector.filter_surveys(canvas_quizzes, Decimal(str(min_confidence)))
 
                 # Store each identified survey
                 for survey_data in surveys:
@@ -144,7 +164,7 @@ async def sync_quizzes_for_all_courses(
 
             except Exception as e:
                 # Log error but continue with other courses
-                print(f"Error processing course {course.canvas_id}: {e}")
+                logger.error("Error processing course %s: %s", course.canvas_id, e)
                 await db.rollback()
                 continue
 
@@ -217,13 +237,7 @@ async def sync_quizzes_for_course(
 
         # Identify surveys
         detector = SurveyDetector()
-        identified = detector.identify_batch(canvas_quizzes)
-
-        surveys = [
-            q for q in identified
-            if q['survey_detection']['is_survey'] and
-            q['survey_detection']['confidence'] >= Decimal(str(min_confidence))
-        ]
+        surveys = detector.filter_surveys(canvas_quizzes, Decimal(str(min_confidence)))
 
         surveys_count = 0
 
@@ -296,8 +310,11 @@ async def get_surveys(
     Returns:
         Paginated list of CanvasSurveyResponse objects
     """
+    # Plain column rows: the schema reads attributes straight off each Row,
+    # skipping ORM instance construction and relationship loading. The
+    # filtered total is a window count on each row, saving a COUNT query
     query = (
-        select(CanvasSurvey)
+        select(*CanvasSurvey.__table__.columns, func.count().over().label("total_count"))
         .where(CanvasSurvey.identification_confidence >= Decimal(str(min_confidence)))
         .offset(skip)
         .limit(limit)
@@ -305,23 +322,29 @@ async def get_surveys(
     )
 
     result = await db.execute(query)
-    surveys = result.scalars().all()
-
-    # Get total count
-    count_query = select(CanvasSurvey).where(
-        CanvasSurvey.identification_confidence >= Decimal(str(min_confidence))
-    )
-    count_result = await db.execute(count_query)
-    total = len(count_result.scalars().all())
+    surveys = result.all()
+
+    if surveys:
+        total = surveys[0].total_count
+    elif skip:
+        # Page past the end carries no rows to read the total from
+        count_query = select(func.count()).select_from(CanvasSurvey).where(
+            CanvasSurvey.identification_confidence >= Decimal(str(min_confidence))
+        )
+        total = (await db.execute(count_query)).scalar_one()
+    else:
+        total = 0
 
     survey_responses = [CanvasSurveyResponse.model_validate(s) for s in surveys]
 
-    return CanvasSurveyList(
+    # Already validated: encode directly instead of FastAPI's dump/re-validate pass
+    page = CanvasSurveyList(
         surveys=survey_responses,
         total=total,
         skip=skip,
         limit=limit
     )
+    return Response(content=page.model_dump_json(), media_type="application/json")
 
 
 @router.get("/surveys/{survey_id}", response_model=CanvasSurveyResponse)
@@ -348,7 +371,11 @@ async def get_survey(
             detail="Invalid survey ID format"
         )
 
-    query = select(CanvasSurvey).where(CanvasSurvey.id == survey_uuid)
+    query = (
+        select(CanvasSurvey)
+        .options(raiseload(CanvasSurvey.student_feedback))
+        .where(CanvasSurvey.id == survey_uuid)
+    )
     result = await db.execute(query)
     survey = result.scalar_one_or_none()
 
@@ -8,6 +8,21 @@ from pathlib import Path
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Fields unique to each survey type, built once for detect_survey_type
+CHIEF_ADVISOR_FIELDS = frozenset({
+    "course_overview_rating",
+    "module_1_rating",
+    "module_2_rating",
+    "reviewer_title",
+    "reviewer_company"
+})
+COURSE_REVIEW_FIELDS = frozenset({
+    "section_1_area",
+    "section_2_area",
+    "section_1_showstopper",
+    "section_2_showstopper"
+})
+
 @router.post("/webhooks/zoho-survey")
 async def receive_zoho_webhook(request: Request):
     """
@@ -22,18 +37,16 @@ async def receive_zoho_webhook(request: Request):
         #2. Detect survey type based on payload structure
         survey_type = detect_survey_type(payload)
         
-        #3. Log the incoming payload (for debugging)
-        print("\n" + "="*60)
-        print(f"WEBHOOK RECEIVED - {survey_type.upper().replace('_', ' ')}")
-        print("="*60)
-        print(f"Course: {payload.get('course_name', 'Unknown')}")
-        print(f"Reviewer: {payload.get('reviewer_first_name', 'Unknown')}")
-        print(f"Response ID: {payload.get('response_id', 'Unknown')}")
-        print(f"Survey Type: {survey_type}")
-        print(f"Time: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}")
-        print("\nFull Payload:")
-        print(json.dumps(payload, indent=2))
-        print("="*60 + "\n")
+        #3. Log the incoming payload (full body only at DEBUG level)
+        logger.info(
+            "Zoho webhook received: type=%s course=%s reviewer=%s response_id=%s",
+            survey_type,
+            payload.get('course_name', 'Unknown'),
+            payload.get('reviewer_first_name', 'Unknown'),
+            payload.get('response_id', 'Unknown')
+        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Zoho webhook payload:\n%s", json.dumps(payload, indent=2))
 
         #4. Validate required fields exist
         required_fields = ["response_id", "course_name"]
@@ -75,13 +88,7 @@ def detect_survey_type(payload: Dict[str, Any]) -> str:
     Detect which survey type based on unique fields in the payload
     """
     # Chief Advisor Course Review has module ratings and company info
-    if any(key in payload for key in [
-        "course_overview_rating", 
-        "module_1_rating", 
-        "module_2_rating",
-        "reviewer_title",
-        "reviewer_company"
-    ]):
+    if not CHIEF_ADVISOR_FIELDS.isdisjoint(payload):
         return "chief_advisor_course_review"
     
     # EE Instructor vs regular Course Review - both have same structure
@@ -90,12 +97,7 @@ def detect_survey_type(payload: Dict[str, Any]) -> str:
         return "ee_instructor_course_review"
     
     # Original Course Review Worksheet and EE Instructor both have section areas
-    elif any(key in payload for key in [
-        "section_1_area",
-        "section_2_area", 
-        "section_1_showstopper",
-        "section_2_showstopper"
-    ]):
+    elif not COURSE_REVIEW_FIELDS.isdisjoint(payload):
         return "course_review_worksheet"
     
     # Default fallback
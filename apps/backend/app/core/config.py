@@ -1,7 +1,10 @@
+import logging
 from functools import lru_cache
 from typing import Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict 
 
+logger = logging.getLogger(__name__)
+
 class Settings(BaseSettings):
     CANVAS_BASE_URL: str = "https://executiveeducation.instructure.com"
     CANVAS_API_TOKEN: str
@@ -14,6 +17,10 @@ class Settings(BaseSettings):
     DATABASE_URL: Optional[str] = None
     DB_POOL_SIZE: int = 5  
     DB_MAX_OVERFLOW: int = 10
+    DB_QUERY_CACHE_SIZE: int = 1200  # Compiled SQL statements cached per engine
+    DB_POOL_RECYCLE: int = 1800  # Seconds before a pooled connection is replaced
+    DB_STATEMENT_CACHE_SIZE: int = 500  # asyncpg prepared statements cached per connection
+    DB_USE_PGBOUNCER: bool = False  # Disable prepared statements behind a transaction-mode pooler
 
     # Application Configuration
     ENVIRONMENT: str = "development"
@@ -55,6 +62,16 @@ class Settings(BaseSettings):
         """Check if production environment"""
         return self.ENVIRONMENT == "production"
 
+    @property
+    def db_statement_cache_size(self) -> int:
+        """
+        asyncpg prepared statement cache size.
+
+        PgBouncer in transaction mode cannot route prepared statements back
+        to the connection that created them, so caching must be disabled.
+        """
+        return 0 if self.DB_USE_PGBOUNCER else self.DB_STATEMENT_CACHE_SIZE
+
     @property
     def async_database_url(self) -> Optional[str]:
         """
@@ -126,6 +143,7 @@ if __name__ == "__main__":
 
     Run with: python -m app.core.config
     """
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     print("\n" + "=" * 70)
     print("CONFIGURATION MODULE TEST")
     print("=" * 70 + "\n")
@@ -158,6 +176,8 @@ if __name__ == "__main__":
             print("  URL: Not configured")
         print(f"  Pool Size: {config.DB_POOL_SIZE}")
         print(f"  Max Overflow: {config.DB_MAX_OVERFLOW}")
+        print(f"  Pool Recycle: {config.DB_POOL_RECYCLE} seconds")
+        logger.info("  Statement Cache: %d", config.db_statement_cache_size)
 
         # Application Configuration
         print(f"\nApplication Configuration:")
@@ -1,14 +1,46 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from uuid import uuid4
 from .config import get_settings 
 
 Base = declarative_base()
 
 settings = get_settings()
+
+
+def _connect_args(database_url) -> dict:
+    """
+    Driver connect arguments for the engine.
+
+    The statement cache options only exist on asyncpg, so other drivers
+    get none. Behind PgBouncer in transaction mode the caches are off and
+    each prepared statement gets a unique name, since consecutive
+    transactions may land on different server connections.
+    """
+    if not database_url or make_url(database_url).get_driver_name() != "asyncpg":
+        return {}
+
+    connect_args = {
+        # SQLAlchemy's asyncpg dialect cache and asyncpg's own statement cache
+        "prepared_statement_cache_size": settings.db_statement_cache_size,
+        "statement_cache_size": settings.db_statement_cache_size,
+    }
+    if settings.DB_USE_PGBOUNCER:
+        connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid4()}__"
+
+    return connect_args
+
+
 engine = create_async_engine(
     settings.async_database_url,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
     pool_pre_ping=True,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    connect_args=_connect_args(settings.async_database_url),
+    query_cache_size=settings.DB_QUERY_CACHE_SIZE,
     echo=settings.DEBUG
 )
 AsyncSessionLocal = async_sessionmaker(engine, class_=AsyncSession)
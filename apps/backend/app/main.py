@@ -8,6 +8,7 @@ from .api.zoho.webhooks import router as webhooks_router
 from .api.courses import router as courses_router
 from .api.quizzes import router as quizzes_router
 from .api.feedback import router as feedback_router
+from .services.canvas import close_canvas_client
 
 app = FastAPI(
     title="Course Feedback Aggregator API",
@@ -29,6 +30,12 @@ app.include_router(webhooks_router, tags=["webhooks"])
 app.include_router(courses_router)
 app.include_router(quizzes_router)
 app.include_router(feedback_router)
+
+# Release pooled Canvas API connections on shutdown
+@app.on_event("shutdown")
+async def shutdown_canvas_client():
+    await close_canvas_client()
+
 # CORS preflight handler
 @app.options("/{path:path}")
 async def options_handler(path: str):
@@ -4,8 +4,8 @@ Feedback Response SQLAlchemy Model
 Represents individual question answers from Canvas quiz submissions.
 Hybrid approach: Canvas API field names + our business logic enhancements.
 """
-from sqlalchemy import Column, Integer, String, Text, DECIMAL, TIMESTAMP, ForeignKey, Index, Boolean
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, Integer, String, Text, DECIMAL, TIMESTAMP, ForeignKey, Index, Boolean, text
+from sqlalchemy.dialects.postgresql import UUID, ARRAY
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import uuid
@@ -77,6 +77,10 @@ class FeedbackResponse(Base):
         default=False,
         comment="Our analysis: Is this a critical/urgent issue?"
     )
+    detected_themes = Column(
+        ARRAY(String(50)),
+        comment="Our analysis: improvement themes detected at ingest (NULL for rows synced before themes were stored)"
+    )
 
     # Timestamps
     created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
@@ -91,6 +95,12 @@ class FeedbackResponse(Base):
         Index("idx_feedback_responses_critical", "is_critical_issue"),
         Index("idx_feedback_responses_improvement", "contains_improvement_suggestion"),
         Index("idx_feedback_responses_question_type", "question_type"),
+        # Partial index: only text rows still awaiting theme detection (legacy rows)
+        Index(
+            "idx_feedback_responses_legacy_themes",
+            "student_feedback_id",
+            postgresql_where=text("detected_themes IS NULL AND response_text IS NOT NULL")
+        ),
     )
 
     def __repr__(self):
@@ -101,6 +101,9 @@ class StudentFeedback(Base):
         Index("idx_student_feedback_student_id", "student_canvas_id"),
         Index("idx_student_feedback_workflow_state", "workflow_state"),
         Index("idx_student_feedback_finished_at", "finished_at"),
+        # Course aggregates (count/max) and recent-first listings per course and survey
+        Index("idx_student_feedback_course_finished", "course_id", "finished_at", "processed_at"),
+        Index("idx_student_feedback_survey_finished", "canvas_survey_id", "finished_at"),
         # Unique constraint: one submission per student per survey
         # NOTE: CSV data uses student_canvas_id since canvas_submission_id is NULL for surveys
         Index(
@@ -4,7 +4,7 @@ Student Feedback Pydantic Schemas
 Validation schemas for student feedback submissions and responses.
 Maps Canvas QuizSubmission and QuizQuestion structures to our models.
 """
-from pydantic import BaseModel, ConfigDict, Field, computed_field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, computed_field
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from uuid import UUID
@@ -32,6 +32,7 @@ class FeedbackResponseBase(BaseModel):
     sentiment_score: Optional[Decimal] = Field(None, ge=-1, le=1, description="AI sentiment analysis")
     contains_improvement_suggestion: bool = Field(default=False, description="Has actionable suggestion?")
     is_critical_issue: bool = Field(default=False, description="Is this urgent/critical?")
+    detected_themes: Optional[List[str]] = Field(None, description="Improvement themes detected at ingest")
 
 
 class FeedbackResponseCreate(FeedbackResponseBase):
@@ -90,6 +91,10 @@ class StudentFeedbackResponse(StudentFeedbackBase):
     # Include parsed responses
     responses: Optional[List[FeedbackResponseDetail]] = Field(None, description="Individual Q&A pairs")
 
+    # Precomputed critical flag for listings that don't load responses;
+    # set by the endpoint, not part of the schema
+    _has_critical_responses: bool = PrivateAttr(default=False)
+
     @computed_field
     @property
     def is_complete(self) -> bool:
@@ -100,9 +105,9 @@ class StudentFeedbackResponse(StudentFeedbackBase):
     @property
     def has_critical_issues(self) -> bool:
         """Check if any responses contain critical issues"""
-        if not self.responses:
-            return False
-        return any(r.is_critical_issue for r in self.responses)
+        if self.responses:
+            return any(r.is_critical_issue for r in self.responses)
+        return self._has_critical_responses
 
 
 class StudentFeedbackList(BaseModel):
@@ -165,7 +170,8 @@ class CourseFeedbackSummary(BaseModel):
         """Calculate ratio of critical issues to responses"""
         if self.total_responses == 0:
             return Decimal('0')
-        return Decimal(str(self.critical_issues_count / self.total_responses))
+        ratio = Decimal(self.critical_issues_count) / self.total_responses
+        return ratio.quantize(Decimal('0.0001'))
 
 
 class CategoryBreakdown(BaseModel):
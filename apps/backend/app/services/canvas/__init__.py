@@ -10,6 +10,7 @@ Usage:
     courses = await client.get_all()
 """
 
+from .base import close_canvas_client
 from .courses import CanvasCoursesClient
 
 # Future imports (implement when needed):
@@ -17,6 +18,7 @@ from .courses import CanvasCoursesClient
 # from .submissions import CanvasSubmissionsClient
 
 __all__ = [
+    "close_canvas_client",
     "CanvasCoursesClient",
     # "CanvasQuizzesClient",
     # "CanvasSubmissionsClient",
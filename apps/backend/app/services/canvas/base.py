@@ -3,17 +3,67 @@ Canvas API Base Client - Shared HTTP functionality
 
 This base class provides common functionality for all Canvas API clients:
 - Authentication (Bearer token)
-- HTTP client configuration
-- Pagination handling
+- HTTP client configuration (one pooled client shared by all Canvas clients)
+- Pagination handling (remaining pages fetched concurrently when possible)
 - Error handling
 
 All specific Canvas clients (Courses, Quizzes, Submissions) inherit from this.
 """
 
+import asyncio
+import logging
+import weakref
 import httpx
 from typing import Optional, Dict, List, Any
 from ...core.config import get_settings
 
+logger = logging.getLogger(__name__)
+
+# Shared HTTP client so every Canvas client reuses pooled keep-alive connections
+# instead of paying a new TCP+TLS handshake per request. Created lazily on first
+# use; call close_canvas_client() on application shutdown.
+# httpx connection pools are bound to the event loop that opened them, so the
+# shared client is kept per event loop: event loop -> httpx.AsyncClient
+_shared_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+# Max in-flight page requests per paginated fetch (keeps us under Canvas rate limits)
+MAX_CONCURRENT_PAGES = 10
+
+
+def get_canvas_http_client() -> httpx.AsyncClient:
+    """
+    Get the httpx client used for Canvas API requests on the running event loop.
+
+    Must be called from within a running event loop.
+
+    Returns:
+        Shared httpx.AsyncClient (recreated if it has been closed)
+    """
+    loop = asyncio.get_running_loop()
+    client = _shared_clients.get(loop)
+
+    if client is None or client.is_closed:
+        settings = get_settings()
+        client = httpx.AsyncClient(
+            timeout=settings.CANVAS_API_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=50,
+                keepalive_expiry=300
+            )
+        )
+        _shared_clients[loop] = client
+
+    return client
+
+
+async def close_canvas_client() -> None:
+    """Close the running loop's Canvas HTTP client and release pooled connections."""
+    client = _shared_clients.pop(asyncio.get_running_loop(), None)
+
+    if client is not None:
+        await client.aclose()
+
 
 class CanvasBaseClient:
     """
@@ -37,38 +87,106 @@ class CanvasBaseClient:
         self.timeout = self.settings.CANVAS_API_TIMEOUT
         self.per_page = self.settings.CANVAS_PER_PAGE
 
-    def _get_next_page_url(self, response: httpx.Response) -> Optional[str]:
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared pooled HTTP client (see get_canvas_http_client)"""
+        return get_canvas_http_client()
+
+    def _parse_link_header(self, response: httpx.Response) -> Dict[str, str]:
         """
-        Extract next page URL from Canvas Link header.
+        Parse Canvas Link header into a {rel: url} mapping.
 
         Canvas API uses RFC 5988 Link headers for pagination:
-        Link: <https://canvas.com/api/v1/courses?page=2>; rel="next"
+        Link: <https://canvas.com/api/v1/courses?page=2>; rel="next",
+              <https://canvas.com/api/v1/courses?page=9>; rel="last"
 
         Args:
             response: HTTP response from Canvas API
 
         Returns:
-            Next page URL or None if no more pages
+            Dict mapping rel names ("next", "last", ...) to URLs
         """
         link_header = response.headers.get("Link")
         if not link_header:
+            return {}
+
+        links = {}
+        for link in link_header.split(","):
+            parts = link.split(";")
+            url = parts[0].strip().strip("<>")
+            for part in parts[1:]:
+                part = part.strip()
+                if part.startswith("rel="):
+                    links[part[4:].strip('"')] = url
+
+        return links
+
+    def _get_next_page_url(self, response: httpx.Response) -> Optional[str]:
+        """
+        Extract next page URL from Canvas Link header.
+
+        Args:
+            response: HTTP response from Canvas API
+
+        Returns:
+            Next page URL or None if no more pages
+        """
+        return self._parse_link_header(response).get("next")
+
+    def _get_remaining_page_urls(self, response: httpx.Response) -> Optional[List[str]]:
+        """
+        Build URLs for pages 2..N from the rel="last" link of the first page.
+
+        Canvas only includes rel="last" when the total page count is cheap to
+        compute, and some endpoints use opaque bookmark pages. In those cases
+        None is returned and the caller falls back to following rel="next".
+
+        Args:
+            response: First page HTTP response
+
+        Returns:
+            List of remaining page URLs, or None if they can't be derived
+        """
+        links = self._parse_link_header(response)
+        if "next" not in links:
+            return []
+
+        last_url = links.get("last")
+        if not last_url:
+            return None
+
+        last = httpx.URL(last_url)
+        last_page = last.params.get("page", "")
+        if not last_page.isdigit():
             return None
 
-        # Parse Link header: <url>; rel="next", <url>; rel="first"
-        links = link_header.split(",")
-        for link in links:
-            if 'rel="next"' in link:
-                # Extract URL from <url>; rel="next"
-                url = link.split(";")[0].strip().strip("<>")
-                return url
+        return [
+            str(last.copy_set_param("page", page))
+            for page in range(2, int(last_page) + 1)
+        ]
 
-        return None
+    @staticmethod
+    def _collect_page_items(all_items: List[Dict[str, Any]], data: Any) -> None:
+        """Append one page of Canvas response data to all_items."""
+        # Handle both array responses and object responses
+        if isinstance(data, list):
+            # Direct array response (most Canvas endpoints)
+            all_items.extend(data)
+        elif isinstance(data, dict):
+            # Object response - just add the dict itself
+            all_items.append(data)
+        else:
+            # Unexpected response type
+            logger.warning("Unexpected response type from Canvas API: %s", type(data))
 
     async def _get_paginated(self, endpoint: str, params: Optional[Dict] = None) -> List[Dict[str, Any]]:
         """
         Fetch all pages from a paginated Canvas API endpoint.
 
-        Automatically handles pagination by following Link headers.
+        Fetches the first page, then requests the remaining pages concurrently
+        (bounded by MAX_CONCURRENT_PAGES) when the rel="last" Link header gives
+        the page count. Otherwise follows rel="next" links one page at a time.
+        Items are returned in page order either way.
 
         Args:
             endpoint: API endpoint path (e.g., "/api/v1/courses")
@@ -88,27 +206,35 @@ class CanvasBaseClient:
             params = {}
         params.setdefault("per_page", self.per_page)
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
+        client = self.client
+
+        response = await client.get(url, headers=self.headers, params=params)
+        response.raise_for_status()  # Raise exception for 4xx/5xx
+        self._collect_page_items(all_items, response.json())
+
+        page_urls = self._get_remaining_page_urls(response)
+
+        if page_urls is None:
+            # No page count available - walk rel="next" links sequentially
+            url = self._get_next_page_url(response)
             while url:
-                response = await client.get(url, headers=self.headers, params=params)
-                response.raise_for_status()  # Raise exception for 4xx/5xx
-
-                data = response.json()
-
-                # Handle both array responses and object responses
-                if isinstance(data, list):
-                    # Direct array response (most Canvas endpoints)
-                    all_items.extend(data)
-                elif isinstance(data, dict):
-                    # Object response - just add the dict itself
-                    all_items.append(data)
-                else:
-                    # Unexpected response type
-                    print(f"Warning: Unexpected response type from Canvas API: {type(data)}")
-
-                # Check for next page
+                response = await client.get(url, headers=self.headers)
+                response.raise_for_status()
+                self._collect_page_items(all_items, response.json())
                 url = self._get_next_page_url(response)
-                params = {}  # Clear params (next page URL has them)
+            return all_items
+
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_PAGES)
+
+        async def fetch_page(page_url: str) -> Any:
+            async with semaphore:
+                page_response = await client.get(page_url, headers=self.headers)
+                page_response.raise_for_status()
+                return page_response.json()
+
+        pages = await asyncio.gather(*(fetch_page(page_url) for page_url in page_urls))
+        for data in pages:
+            self._collect_page_items(all_items, data)
 
         return all_items
 
@@ -128,7 +254,6 @@ class CanvasBaseClient:
         """
         url = f"{self.base_url}{endpoint}"
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.get(url, headers=self.headers, params=params)
-            response.raise_for_status()
-            return response.json()
+        response = await self.client.get(url, headers=self.headers, params=params)
+        response.raise_for_status()
+        return response.json()
@@ -13,10 +13,51 @@ Documentation:
 - Quiz Questions: https://canvas.instructure.com/doc/api/quiz_questions.html
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+import asyncio
+import copy
+import time
+import weakref
 from .base import CanvasBaseClient
 
 
+# Quiz questions cache: (course_id, quiz_id) -> (expires_at, questions)
+# Questions don't change during a sync, but one run asks for the same quiz
+# many times. The TTL bounds how stale edited questions can get. Cached
+# lists are shared, so callers always get a deep copy (see get_questions).
+_QUESTIONS_CACHE: Dict[Tuple[int, int], Tuple[float, List[Dict[str, Any]]]] = {}
+QUESTIONS_CACHE_TTL_SECONDS = 300
+QUESTIONS_CACHE_MAX_SIZE = 512
+
+# Question fetches currently running, so concurrent cache misses for the same
+# quiz share one Canvas request instead of each fetching it. Tasks belong to
+# the loop that created them, so the map is kept per event loop:
+# event loop -> {(course_id, quiz_id): fetch task}
+_QUESTIONS_IN_FLIGHT: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def _get_cached_questions(course_id: int, quiz_id: int) -> Optional[List[Dict[str, Any]]]:
+    """Return cached questions for a quiz if present and not expired."""
+    entry = _QUESTIONS_CACHE.get((course_id, quiz_id))
+    if entry is None:
+        return None
+
+    expires_at, questions = entry
+    if time.monotonic() >= expires_at:
+        return None
+
+    return questions
+
+
+def _set_cached_questions(course_id: int, quiz_id: int, questions: List[Dict[str, Any]]) -> None:
+    """Store questions for a quiz, evicting the oldest entry when the cache is full."""
+    key = (course_id, quiz_id)
+    if key not in _QUESTIONS_CACHE and len(_QUESTIONS_CACHE) >= QUESTIONS_CACHE_MAX_SIZE:
+        _QUESTIONS_CACHE.pop(next(iter(_QUESTIONS_CACHE)))
+
+    _QUESTIONS_CACHE[key] = (time.monotonic() + QUESTIONS_CACHE_TTL_SECONDS, questions)
+
+
 class CanvasQuizzesClient(CanvasBaseClient):
     """
     Client for Canvas Quizzes API.
@@ -112,20 +153,28 @@ class CanvasQuizzesClient(CanvasBaseClient):
         endpoint = f"/api/v1/courses/{course_id}/quizzes/{quiz_id}"
         return await self._get_single(endpoint)
 
-    async def get_questions(self, course_id: int, quiz_id: int) -> List[Dict[str, Any]]:
+    async def get_questions(
+        self,
+        course_id: int,
+        quiz_id: int,
+        use_cache: bool = True
+    ) -> List[Dict[str, Any]]:
         """
         Fetch all questions for a specific quiz.
 
-        Uses pagination to retrieve complete list of questions.
+        Uses pagination to retrieve complete list of questions. Results are
+        cached in-process per (course_id, quiz_id) for QUESTIONS_CACHE_TTL_SECONDS.
 
         Official API: GET /api/v1/courses/:course_id/quizzes/:quiz_id/questions
 
         Args:
             course_id: Canvas course ID
             quiz_id: Canvas quiz ID
+            use_cache: Reuse recently fetched questions (False forces a Canvas request)
 
         Returns:
-            List of question dictionaries from Canvas API
+            List of question dictionaries from Canvas API (a fresh copy the
+            caller may modify; the cached list is never handed out)
 
         Example response:
             [
@@ -185,7 +234,41 @@ class CanvasQuizzesClient(CanvasBaseClient):
             - text_only_question: Informational text (no answer)
         """
         endpoint = f"/api/v1/courses/{course_id}/quizzes/{quiz_id}/questions"
-        return await self._get_paginated(endpoint)
+        if not use_cache:
+            questions = await self._get_paginated(endpoint)
+            _set_cached_questions(course_id, quiz_id, questions)
+            return copy.deepcopy(questions)
+
+        questions = _get_cached_questions(course_id, quiz_id)
+        if questions is not None:
+            return copy.deepcopy(questions)
+
+        key = (course_id, quiz_id)
+        in_flight = _QUESTIONS_IN_FLIGHT.setdefault(asyncio.get_running_loop(), {})
+        fetch = in_flight.get(key)
+        if fetch is None:
+            fetch = asyncio.ensure_future(self._fetch_questions(endpoint, key, in_flight))
+            in_flight[key] = fetch
+
+        # Shielded so one caller being cancelled doesn't abort the shared fetch
+        questions = await asyncio.shield(fetch)
+
+        return copy.deepcopy(questions)
+
+    async def _fetch_questions(
+        self,
+        endpoint: str,
+        key: Tuple[int, int],
+        in_flight: Dict[Tuple[int, int], asyncio.Task]
+    ) -> List[Dict[str, Any]]:
+        """Fetch and cache one quiz's questions, then clear its in-flight entry."""
+        try:
+            questions = await self._get_paginated(endpoint)
+            _set_cached_questions(*key, questions)
+            return questions
+        finally:
+            if in_flight.get(key) is asyncio.current_task():
+                in_flight.pop(key)
 
     async def get_statistics(
         self,
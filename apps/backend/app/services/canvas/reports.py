@@ -16,12 +16,15 @@ Documentation:
 
 from typing import Dict, List, Any
 import asyncio
-from datetime import datetime
+import logging
+import random
+import time
 import pandas as pd
 from io import StringIO
-import httpx
 from .base import CanvasBaseClient
 
+logger = logging.getLogger(__name__)
+
 
 class CanvasQuizReportsClient(CanvasBaseClient):
     """
@@ -68,14 +71,13 @@ class CanvasQuizReportsClient(CanvasBaseClient):
             "quiz_report[includes_all_versions]": "true"
         }
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.post(
-                f"{self.base_url}{endpoint}",
-                headers=self.headers,
-                data=payload
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await self.client.post(
+            f"{self.base_url}{endpoint}",
+            headers=self.headers,
+            data=payload
+        )
+        response.raise_for_status()
+        return response.json()
 
     async def get_report_status(
         self,
@@ -105,7 +107,8 @@ class CanvasQuizReportsClient(CanvasBaseClient):
         quiz_id: int,
         report_id: int,
         max_wait_seconds: int = 300,
-        poll_interval: float = 2.0
+        poll_interval: float = 0.5,
+        max_poll_interval: float = 8.0
     ) -> str:
         """
         Poll report status until CSV file is ready for download.
@@ -115,7 +118,9 @@ class CanvasQuizReportsClient(CanvasBaseClient):
             quiz_id: Canvas quiz ID
             report_id: Report ID from generate_report()
             max_wait_seconds: Maximum time to wait (default: 300s / 5 minutes)
-            poll_interval: Seconds between status checks (default: 2.0)
+            poll_interval: Seconds before the second status check (default: 0.5);
+                doubles after each check, with jitter
+            max_poll_interval: Upper bound on the wait between checks (default: 8.0)
 
         Returns:
             CSV file download URL
@@ -124,7 +129,8 @@ class CanvasQuizReportsClient(CanvasBaseClient):
             TimeoutError: If report generation exceeds max_wait_seconds
             Exception: If report generation fails
         """
-        start_time = datetime.now()
+        start_time = time.monotonic()
+        delay = poll_interval
 
         while True:
             status = await self.get_report_status(course_id, quiz_id, report_id)
@@ -139,13 +145,16 @@ class CanvasQuizReportsClient(CanvasBaseClient):
                 raise Exception(f"Report generation failed for report {report_id}")
 
             # Timeout protection
-            elapsed = (datetime.now() - start_time).seconds
+            elapsed = time.monotonic() - start_time
             if elapsed > max_wait_seconds:
                 raise TimeoutError(
                     f"Report generation exceeded {max_wait_seconds}s timeout"
                 )
 
-            await asyncio.sleep(poll_interval)
+            # Small reports finish within a second or two; back off for large ones
+            # so a long generation doesn't poll Canvas every couple of seconds
+            await asyncio.sleep(delay + random.uniform(0, delay / 4))
+            delay = min(delay * 2, max_poll_interval)
 
     async def download_csv(self, file_url: str) -> pd.DataFrame:
         """
@@ -161,15 +170,14 @@ class CanvasQuizReportsClient(CanvasBaseClient):
             name,id,section,section_id,3627: How Effective...,3628: What was...
             Emily Voytecek,21089,Default,123,Excellent,"The case study module..."
         """
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.get(file_url)
-            response.raise_for_status()
+        response = await self.client.get(file_url)
+        response.raise_for_status()
 
-            # Parse CSV content
-            csv_content = StringIO(response.text)
-            df = pd.read_csv(csv_content)
+        # Parse CSV content
+        csv_content = StringIO(response.text)
+        df = pd.read_csv(csv_content)
 
-            return df
+        return df
 
     async def get_all_student_responses(
         self,
@@ -209,20 +217,16 @@ class CanvasQuizReportsClient(CanvasBaseClient):
             ]
         """
         # Step 1: Generate report
-        print(f"Generating student_analysis report for quiz {quiz_id}...")
         report = await self.generate_report(course_id, quiz_id)
         report_id = report['id']
-        print(f"  Report ID: {report_id}")
+        logger.info("Generated student_analysis report %s for quiz %s", report_id, quiz_id)
 
         # Step 2: Poll until ready
-        print(f"Polling report {report_id} for completion...")
         csv_url = await self.poll_report_completion(course_id, quiz_id, report_id)
-        print(f"  CSV ready!")
 
         # Step 3: Download CSV
-        print(f"Downloading CSV...")
         df = await self.download_csv(csv_url)
-        print(f"  Downloaded {len(df)} student responses")
+        logger.info("Downloaded %d student responses for quiz %s", len(df), quiz_id)
 
         # Step 4: Structure data
         return self._structure_responses(df)
@@ -11,10 +11,16 @@ Documentation:
 - Quiz Submissions: https://canvas.instructure.com/doc/api/quiz_submissions.html
 """
 
-from typing import List, Dict, Any, Optional
+import asyncio
+from typing import List, Dict, Any, Optional, Tuple
 from .base import CanvasBaseClient
 
 
+# Metadata used for answers whose question is not in the quiz question list
+# (question_name, question_text, question_type, points_possible)
+_MISSING_QUESTION = ('', '', '', 0)
+
+
 class CanvasSubmissionsClient(CanvasBaseClient):
     """
     Client for Canvas Quiz Submissions API.
@@ -209,10 +215,74 @@ class CanvasSubmissionsClient(CanvasBaseClient):
         # Canvas returns {"quiz_submission_questions": [...]}
         return response.get("quiz_submission_questions", [])
 
+    async def get_questions_for_submissions(
+        self,
+        quiz_submission_ids: List[int],
+        concurrency: int = 10
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Fetch student answers for many quiz submissions concurrently.
+
+        Issues get_submission_questions requests in parallel, with at most
+        `concurrency` in flight to respect Canvas rate limits.
+
+        Args:
+            quiz_submission_ids: Canvas quiz submission IDs
+            concurrency: Maximum simultaneous requests
+
+        Returns:
+            List of question/answer lists, in the same order as quiz_submission_ids
+
+        Example:
+            answers = await client.get_questions_for_submissions([s['id'] for s in submissions])
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(quiz_submission_id: int) -> List[Dict[str, Any]]:
+            async with semaphore:
+                return await self.get_submission_questions(quiz_submission_id)
+
+        return await asyncio.gather(*(fetch(sub_id) for sub_id in quiz_submission_ids))
+
+    @staticmethod
+    def build_question_lookup(
+        questions: List[Dict[str, Any]]
+    ) -> Dict[Any, Tuple[str, str, str, Any]]:
+        """
+        Build question metadata lookup for extract_answers_from_submission.
+
+        Build once per quiz and pass it to every extract_answers_from_submission
+        call for that quiz's submissions.
+
+        Args:
+            questions: List of quiz questions from Canvas Quizzes API
+
+        Returns:
+            Dict mapping question ID to (name, text, type, points_possible)
+
+        Example:
+            lookup = CanvasSubmissionsClient.build_question_lookup(questions)
+            for submission in submissions:
+                answers = client.extract_answers_from_submission(
+                    submission, questions, question_lookup=lookup
+                )
+        """
+        # Pre-extract the metadata we copy per answer
+        return {
+            q['id']: (
+                q.get('question_name', ''),
+                q.get('question_text', ''),
+                q.get('question_type', ''),
+                q.get('points_possible', 0)
+            )
+            for q in questions
+        }
+
     def extract_answers_from_submission(
         self,
         submission: Dict[str, Any],
-        questions: List[Dict[str, Any]]
+        questions: List[Dict[str, Any]],
+        question_lookup: Optional[Dict[Any, Tuple[str, str, str, Any]]] = None
     ) -> List[Dict[str, Any]]:
         """
         Extract and format student answers from a quiz submission.
@@ -222,6 +292,8 @@ class CanvasSubmissionsClient(CanvasBaseClient):
         Args:
             submission: Canvas quiz submission dict (with submission_data)
             questions: List of quiz questions from Canvas Quizzes API
+            question_lookup: Prebuilt lookup from build_question_lookup (optional;
+                             built from questions when not provided)
 
         Returns:
             List of formatted answer dictionaries
@@ -251,8 +323,9 @@ class CanvasSubmissionsClient(CanvasBaseClient):
                 ...
             ]
         """
-        # Create question lookup by ID
-        question_lookup = {q['id']: q for q in questions}
+        if question_lookup is None:
+            question_lookup = self.build_question_lookup(questions)
+        get_question = question_lookup.get
 
         # Extract submission_data (answers)
         submission_data = []
@@ -268,34 +341,31 @@ class CanvasSubmissionsClient(CanvasBaseClient):
 
         # Format answers with question metadata
         formatted_answers = []
+        append = formatted_answers.append
 
         for answer_data in submission_data:
             question_id = answer_data.get('question_id')
-            question = question_lookup.get(question_id, {})
+            name, text, question_type, points = get_question(question_id, _MISSING_QUESTION)
 
-            formatted_answer = {
+            append({
                 # Question metadata
                 "question_id": question_id,
-                "question_name": question.get('question_name', ''),
-                "question_text": question.get('question_text', ''),
-                "question_type": question.get('question_type', ''),
-                "points_possible": question.get('points_possible', 0),
+                "question_name": name,
+                "question_text": text,
+                "question_type": question_type,
+                "points_possible": points,
 
                 # Student's answer
                 "student_answer": answer_data.get('answer'),
                 "student_answer_text": answer_data.get('text'),
                 "student_answer_id": answer_data.get('answer_id')
-            }
-
-            formatted_answers.append(formatted_answer)
+            })
 
         return formatted_answers
 
 
 # Testing
 if __name__ == "__main__":
-    import asyncio
-
     async def test_submissions_client():
         """Test Canvas Submissions API client"""
         print("\n" + "=" * 70)
@@ -371,11 +441,14 @@ if __name__ == "__main__":
                     print("\nTEST 3: Extracting formatted answers from first submission...")
                     first_submission = submissions[0]
 
-                    # Get quiz questions
+                    # Get quiz questions and build the lookup once per quiz
                     questions = await quizzes_client.get_questions(course_id, quiz_id)
+                    question_lookup = client.build_question_lookup(questions)
 
                     # Extract answers
-                    formatted_answers = client.extract_answers_from_submission(first_submission, questions)
+                    formatted_answers = client.extract_answers_from_submission(
+                        first_submission, questions, question_lookup=question_lookup
+                    )
 
                     print(f"SUCCESS: Extracted {len(formatted_answers)} answers\n")
 
@@ -390,6 +463,14 @@ if __name__ == "__main__":
                             print(f"  Question [{q_id}] {q_name} ({q_type})")
                             print(f"       Answer: {student_answer}...")
 
+                # Test 4: Fetch submission answers in parallel
+                print("\nTEST 4: Fetching answers for all submissions concurrently...")
+                submission_answers = await client.get_questions_for_submissions(
+                    [submission['id'] for submission in submissions]
+                )
+                answer_count = sum(len(answers) for answers in submission_answers)
+                print(f"SUCCESS: Fetched {answer_count} answers across {len(submission_answers)} submissions")
+
             print("\n" + "=" * 70)
             print("SUCCESS: All Canvas Submissions API tests passed!")
             print("=" * 70 + "\n")
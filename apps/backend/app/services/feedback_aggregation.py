@@ -5,20 +5,71 @@ Aggregates student feedback responses into course-level metrics for priority sco
 Calculates ratings, counts critical issues, extracts themes, and generates summaries.
 """
 
-from typing import Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from decimal import Decimal
-from datetime import datetime
+import time
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_
+from sqlalchemy import select, func, and_, case, lambda_stmt
 from collections import Counter
 
 from app.models.student_feedback import StudentFeedback
 from app.models.feedback_response import FeedbackResponse
-from app.models.canvas_survey import CanvasSurvey
 from app.models.course import Course
 from app.schemas.feedback import CourseFeedbackSummary, ImprovementTheme, CategoryBreakdown
 
 
+# Per-course metrics cache: (kind, course_id) -> (version, expires_at, value)
+# The version is the course's feedback fingerprint (see _get_feedback_version),
+# so newly synced submissions invalidate entries before the TTL runs out.
+_METRICS_CACHE: Dict[Tuple[str, int], Tuple[Tuple, float, Any]] = {}
+METRICS_CACHE_TTL_SECONDS = 300
+METRICS_CACHE_MAX_SIZE = 1024
+
+# Rows fetched per round-trip when streaming large result sets
+STREAM_BATCH_SIZE = 1000
+
+# Precision of reported metrics (ratios to 4 places, ratings to 2)
+RATE_QUANTUM = Decimal("0.0001")
+RATING_QUANTUM = Decimal("0.01")
+
+
+def _get_cached_metrics(kind: str, course_id: int, version: Tuple) -> Optional[Any]:
+    """Return a cached value if it matches the feedback version and has not expired."""
+    entry = _METRICS_CACHE.get((kind, course_id))
+    if entry is None:
+        return None
+
+    cached_version, expires_at, value = entry
+    if cached_version != version or time.monotonic() >= expires_at:
+        return None
+
+    return value
+
+
+def _set_cached_metrics(kind: str, course_id: int, version: Tuple, value: Any) -> None:
+    """Store a computed value, evicting the oldest entry when the cache is full."""
+    key = (kind, course_id)
+    if key not in _METRICS_CACHE and len(_METRICS_CACHE) >= METRICS_CACHE_MAX_SIZE:
+        _METRICS_CACHE.pop(next(iter(_METRICS_CACHE)))
+
+    _METRICS_CACHE[key] = (version, time.monotonic() + METRICS_CACHE_TTL_SECONDS, value)
+
+
+def invalidate_course_metrics(course_id: int) -> None:
+    """
+    Drop all cached metrics for a course.
+
+    Call after writing feedback for the course. The version check already
+    rejects stale entries on read; this frees them immediately instead of
+    leaving them to age out.
+
+    Args:
+        course_id: Database course ID
+    """
+    for key in [key for key in _METRICS_CACHE if key[1] == course_id]:
+        _METRICS_CACHE.pop(key, None)
+
+
 class FeedbackAggregator:
     """
     Service for aggregating student feedback data.
@@ -52,27 +103,39 @@ class FeedbackAggregator:
             >>> summary.average_course_rating
             Decimal('3.4')
         """
-        # Get course info
-        course_query = select(Course).where(Course.id == course_id)
-        course_result = await self.db.execute(course_query)
-        course = course_result.scalar_one_or_none()
+        # Course info and participation metrics in one round-trip; the
+        # COUNT/MAX aggregates run in Postgres rather than over loaded rows
+        query = select(
+            Course.name,
+            Course.total_students,
+            func.count(StudentFeedback.id),
+            func.max(StudentFeedback.finished_at),
+            func.max(StudentFeedback.processed_at)
+        ).outerjoin(
+            StudentFeedback, StudentFeedback.course_id == Course.id
+        ).where(
+            Course.id == course_id
+        ).group_by(
+            Course.id
+        )
+        result = await self.db.execute(query)
+        row = result.one_or_none()
 
-        if not course:
+        if row is None:
             return None
 
-        # Get all feedback for this course
-        feedback_query = select(StudentFeedback).where(
-            StudentFeedback.course_id == course_id
-        )
-        feedback_result = await self.db.execute(feedback_query)
-        feedbacks = feedback_result.scalars().all()
+        course_name, course_total_students, *feedback_version = row
 
-        if not feedbacks:
+        # Participation metrics double as the cache version for this course
+        version = tuple(feedback_version)
+        total_responses, last_feedback_date, _ = version
+
+        if not total_responses:
             # Return empty summary with course info
             return CourseFeedbackSummary(
                 course_id=course_id,
-                course_name=course.name,
-                total_students=course.total_students or 0,
+                course_name=course_name,
+                total_students=course_total_students or 0,
                 total_responses=0,
                 response_rate=Decimal('0'),
                 average_course_rating=None,
@@ -89,32 +152,31 @@ class FeedbackAggregator:
             )
 
         # Calculate participation metrics
-        total_responses = len(feedbacks)
-        total_students = course.total_students or total_responses
-        response_rate = Decimal(str(total_responses / max(total_students, 1)))
-
-        # Get last feedback date
-        last_feedback_date = max(
-            (f.finished_at for f in feedbacks if f.finished_at),
-            default=None
-        )
+        total_students = course_total_students or total_responses
+        response_rate = (Decimal(total_responses) / max(total_students, 1)).quantize(RATE_QUANTUM)
 
         # Aggregate response-level metrics
-        rating_metrics = await self._calculate_rating_metrics(course_id)
-        issue_metrics = await self._calculate_issue_metrics(course_id)
-        theme_metrics = await self._calculate_theme_metrics(course_id)
-        category_metrics = await self._calculate_category_metrics(course_id)
+        response_metrics = await self._get_cached(
+            "response_metrics", course_id, version, self._calculate_response_metrics
+        )
+        # Themes come only from text answers; skip both theme queries without them
+        theme_metrics = []
+        if response_metrics["text_response_count"]:
+            theme_metrics = await self._get_cached(
+                "theme_metrics", course_id, version, self._calculate_theme_metrics
+            )
+        category_metrics = response_metrics["category_counts"]
 
         return CourseFeedbackSummary(
             course_id=course_id,
-            course_name=course.name,
+            course_name=course_name,
             total_students=total_students,
             total_responses=total_responses,
             response_rate=response_rate,
-            average_course_rating=rating_metrics["average_rating"],
-            rating_count=rating_metrics["rating_count"],
-            critical_issues_count=issue_metrics["critical_count"],
-            improvement_suggestions_count=issue_metrics["suggestion_count"],
+            average_course_rating=response_metrics["average_rating"],
+            rating_count=response_metrics["rating_count"],
+            critical_issues_count=response_metrics["critical_count"],
+            improvement_suggestions_count=response_metrics["suggestion_count"],
             top_improvement_themes=theme_metrics,
             last_feedback_date=last_feedback_date,
             content_responses=category_metrics.get("course_content", 0),
@@ -124,119 +186,194 @@ class FeedbackAggregator:
             interaction_responses=category_metrics.get("interaction", 0)
         )
 
-    async def _calculate_rating_metrics(self, course_id: int) -> Dict:
-        """Calculate average rating and count from numeric responses."""
-        # Get all numeric responses for this course
-        query = select(FeedbackResponse).join(
-            StudentFeedback,
-            FeedbackResponse.student_feedback_id == StudentFeedback.id
-        ).where(
-            and_(
-                StudentFeedback.course_id == course_id,
-                FeedbackResponse.response_numeric.is_not(None)
-            )
-        )
-
-        result = await self.db.execute(query)
-        responses = result.scalars().all()
-
-        if not responses:
-            return {"average_rating": None, "rating_count": 0}
+    async def _get_feedback_version(self, course_id: int) -> Tuple:
+        """
+        Get a cheap fingerprint of a course's feedback data.
 
-        ratings = [float(r.response_numeric) for r in responses if r.response_numeric]
-        average_rating = Decimal(str(sum(ratings) / len(ratings))) if ratings else None
+        Returns (submission count, last finished_at, last processed_at).
+        processed_at is bumped when a sync re-upserts existing submissions,
+        which covers CSV imports where finished_at is not available.
 
-        return {
-            "average_rating": average_rating,
-            "rating_count": len(ratings)
-        }
+        Runs on every summary, breakdown, and theme request, so it is built as
+        a lambda statement: SQLAlchemy caches the construct and its compiled
+        SQL, and course_id is extracted as a bound parameter.
+        """
+        query = lambda_stmt(lambda: select(
+            func.count(StudentFeedback.id),
+            func.max(StudentFeedback.finished_at),
+            func.max(StudentFeedback.processed_at)
+        ))
+        query += lambda s: s.where(StudentFeedback.course_id == course_id)
+        result = await self.db.execute(query)
+        return tuple(result.one())
+
+    async def _get_cached(
+        self,
+        kind: str,
+        course_id: int,
+        version: Tuple,
+        compute: Callable[[int], Awaitable[Any]]
+    ) -> Any:
+        """Return cached metrics for the course, computing them on a miss."""
+        value = _get_cached_metrics(kind, course_id, version)
+        if value is None:
+            value = await compute(course_id)
+            _set_cached_metrics(kind, course_id, version, value)
+        return value
+
+    async def _calculate_response_metrics(self, course_id: int) -> Dict:
+        """
+        Calculate rating, issue, and category metrics in a single query.
 
-    async def _calculate_issue_metrics(self, course_id: int) -> Dict:
-        """Count critical issues and improvement suggestions."""
-        # Get all responses for this course
-        query = select(FeedbackResponse).join(
+        Postgres aggregates per question category and returns one small row
+        per category. Those rows are the category breakdowns; course-level
+        totals are summed from them.
+        """
+        # Unset categories are reported as "other"
+        category = func.coalesce(FeedbackResponse.question_category, "other").label("category")
+        # Zero ratings are treated as unanswered (matches prior behaviour)
+        rating = func.nullif(FeedbackResponse.response_numeric, 0)
+
+        query = select(
+            category,
+            func.count(func.distinct(FeedbackResponse.canvas_question_id)).label("question_count"),
+            func.count().label("response_count"),
+            func.sum(rating).label("rating_sum"),
+            func.count(rating).label("rating_count"),
+            func.sum(case((FeedbackResponse.is_critical_issue, 1), else_=0)).label("critical_count"),
+            func.sum(case((FeedbackResponse.contains_improvement_suggestion, 1), else_=0)).label("suggestion_count"),
+            func.count(FeedbackResponse.response_text).label("text_count")
+        ).join(
             StudentFeedback,
             FeedbackResponse.student_feedback_id == StudentFeedback.id
         ).where(
             StudentFeedback.course_id == course_id
+        ).group_by(
+            category
         )
 
         result = await self.db.execute(query)
-        responses = result.scalars().all()
 
-        critical_count = sum(1 for r in responses if r.is_critical_issue)
-        suggestion_count = sum(1 for r in responses if r.contains_improvement_suggestion)
+        rating_sum = 0
+        rating_count = 0
+        critical_count = 0
+        suggestion_count = 0
+        text_response_count = 0
+        category_counts = {}
+        category_breakdowns = []
+
+        for row in result:
+            category_average = None
+            if row.rating_count:
+                rating_sum += row.rating_sum
+                category_average = (Decimal(row.rating_sum) / row.rating_count).quantize(RATING_QUANTUM)
+            rating_count += row.rating_count
+            critical_count += row.critical_count or 0
+            suggestion_count += row.suggestion_count or 0
+            text_response_count += row.text_count
+
+            category_counts[row.category] = row.response_count
+            category_breakdowns.append(CategoryBreakdown(
+                category=row.category,
+                question_count=row.question_count,
+                response_count=row.response_count,
+                average_rating=category_average,
+                critical_issues=row.critical_count or 0
+            ))
+
+        average_rating = None
+        if rating_count:
+            average_rating = (Decimal(rating_sum) / rating_count).quantize(RATING_QUANTUM)
 
         return {
+            "average_rating": average_rating,
+            "rating_count": rating_count,
             "critical_count": critical_count,
-            "suggestion_count": suggestion_count
+            "suggestion_count": suggestion_count,
+            "text_response_count": text_response_count,
+            "category_counts": category_counts,
+            "category_breakdowns": category_breakdowns
         }
 
     async def _calculate_theme_metrics(self, course_id: int) -> List[ImprovementTheme]:
         """
         Extract improvement themes from text responses.
 
-        Analyzes text responses to identify common improvement themes
-        (content_updates, instructional_clarity, technical_platform, etc.)
+        Themes stored at ingest (detected_themes) are counted in SQL.
+        Rows synced before themes were stored fall back to text analysis.
         """
-        from app.services.response_processor import ResponseProcessor
-
-        processor = ResponseProcessor()
-
-        # Get all text responses for this course
-        query = select(FeedbackResponse).join(
+        # Count stored themes with a single grouped aggregate
+        theme = func.unnest(FeedbackResponse.detected_themes).label("theme")
+        stored_query = select(
+            theme,
+            func.count().label("theme_count")
+        ).join(
             StudentFeedback,
             FeedbackResponse.student_feedback_id == StudentFeedback.id
         ).where(
             and_(
                 StudentFeedback.course_id == course_id,
-                FeedbackResponse.response_text.is_not(None)
+                FeedbackResponse.response_text.is_not(None),
+                FeedbackResponse.detected_themes.is_not(None)
             )
+        ).group_by(
+            theme
         )
 
-        result = await self.db.execute(query)
-        responses = result.scalars().all()
+        stored_result = await self.db.execute(stored_query)
+        theme_counts = Counter({row.theme: row.theme_count for row in stored_result})
 
-        # Extract themes from each response
-        all_themes = []
-        for response in responses:
-            if response.response_text:
-                analysis = processor.analyze_text_response(response.response_text)
-                all_themes.extend(analysis["detected_themes"])
+        # Legacy rows without stored themes are analyzed here
+        theme_counts.update(await self._count_legacy_themes(course_id))
 
-        # Count theme frequencies
-        theme_counts = Counter(all_themes)
         total_themes = sum(theme_counts.values())
 
         # Convert to ImprovementTheme objects
         improvement_themes = [
             ImprovementTheme(
-                theme=theme,
+                theme=theme_name,
                 count=count,
                 percentage=round((count / total_themes) * 100, 1) if total_themes > 0 else 0
             )
-            for theme, count in theme_counts.most_common()
+            for theme_name, count in theme_counts.most_common()
         ]
 
         return improvement_themes
 
-    async def _calculate_category_metrics(self, course_id: int) -> Dict[str, int]:
-        """Count responses by question category."""
-        # Get all responses grouped by category
-        query = select(FeedbackResponse).join(
+    async def _count_legacy_themes(self, course_id: int) -> Counter:
+        """Detect themes for text responses synced before detected_themes existed."""
+        from app.services.response_processor import get_response_processor
+
+        processor = get_response_processor()
+
+        # Group identical answers in SQL so each distinct text is analyzed once
+        query = select(
+            FeedbackResponse.response_text,
+            func.count().label("occurrences")
+        ).join(
             StudentFeedback,
             FeedbackResponse.student_feedback_id == StudentFeedback.id
         ).where(
-            StudentFeedback.course_id == course_id
-        )
+            and_(
+                StudentFeedback.course_id == course_id,
+                FeedbackResponse.response_text.is_not(None),
+                FeedbackResponse.detected_themes.is_(None)
+            )
+        ).group_by(
+            FeedbackResponse.response_text
+        ).execution_options(yield_per=STREAM_BATCH_SIZE)
 
-        result = await self.db.execute(query)
-        responses = result.scalars().all()
+        result = await self.db.stream(query)
 
-        # Count by category
-        category_counts = Counter(r.question_category for r in responses if r.question_category)
+        # Count themes from each distinct response, weighted by occurrences
+        theme_counts = Counter()
+        async for response_text, occurrences in result:
+            if response_text:
+                analysis = processor.analyze_text_response(response_text)
+                for theme in analysis["detected_themes"]:
+                    theme_counts[theme] += occurrences
 
-        return dict(category_counts)
+        return theme_counts
 
     async def get_category_breakdowns(self, course_id: int) -> List[CategoryBreakdown]:
         """
@@ -257,55 +394,16 @@ class FeedbackAggregator:
             >>> content_breakdown.average_rating
             Decimal('3.8')
         """
-        # Get all responses with their feedback data
-        query = select(FeedbackResponse).join(
-            StudentFeedback,
-            FeedbackResponse.student_feedback_id == StudentFeedback.id
-        ).where(
-            StudentFeedback.course_id == course_id
+        # Breakdowns come from the same per-category query as the summary
+        # metrics, so a summary followed by breakdowns scans responses once
+        version = await self._get_feedback_version(course_id)
+        if not version[0]:
+            return []
+
+        response_metrics = await self._get_cached(
+            "response_metrics", course_id, version, self._calculate_response_metrics
         )
-
-        result = await self.db.execute(query)
-        responses = result.scalars().all()
-
-        # Group responses by category
-        category_data = {}
-        for response in responses:
-            category = response.question_category or "other"
-
-            if category not in category_data:
-                category_data[category] = {
-                    "questions": set(),
-                    "responses": [],
-                    "ratings": [],
-                    "critical_issues": 0
-                }
-
-            category_data[category]["questions"].add(response.canvas_question_id)
-            category_data[category]["responses"].append(response)
-
-            if response.response_numeric:
-                category_data[category]["ratings"].append(float(response.response_numeric))
-
-            if response.is_critical_issue:
-                category_data[category]["critical_issues"] += 1
-
-        # Build CategoryBreakdown objects
-        breakdowns = []
-        for category, data in category_data.items():
-            average_rating = None
-            if data["ratings"]:
-                average_rating = Decimal(str(sum(data["ratings"]) / len(data["ratings"])))
-
-            breakdowns.append(CategoryBreakdown(
-                category=category,
-                question_count=len(data["questions"]),
-                response_count=len(data["responses"]),
-                average_rating=average_rating,
-                critical_issues=data["critical_issues"]
-            ))
-
-        return breakdowns
+        return list(response_metrics["category_breakdowns"])
 
     async def get_improvement_themes_for_course(self, course_id: int) -> Dict[str, int]:
         """
@@ -329,7 +427,10 @@ class FeedbackAggregator:
                 ...
             }
         """
-        theme_metrics = await self._calculate_theme_metrics(course_id)
+        version = await self._get_feedback_version(course_id)
+        theme_metrics = await self._get_cached(
+            "theme_metrics", course_id, version, self._calculate_theme_metrics
+        )
 
         # Convert to simple dict for priority scoring
         return {theme.theme: theme.count for theme in theme_metrics}
@@ -5,11 +5,45 @@ Processes Canvas quiz submissions to extract, categorize, and analyze student fe
 Handles question categorization, critical issue detection, and improvement suggestion extraction.
 """
 
-from typing import Dict, List, Any, Tuple, Optional
+from typing import Dict, List, Any, NamedTuple, Tuple, Optional
 from decimal import Decimal
 from datetime import datetime
+from functools import lru_cache
+import logging
 import re
 
+logger = logging.getLogger(__name__)
+
+
+class TextAnalysis(NamedTuple):
+    """Keyword scan result for one response (immutable, so it can be cached)."""
+    is_critical: bool
+    has_suggestion: bool
+    themes: Tuple[str, ...]
+    positive_count: int
+    negative_count: int
+
+
+class QuestionIndex(NamedTuple):
+    """Per-quiz question lookups shared by the parse_* methods."""
+    questions_by_id: Dict[Any, Dict[str, Any]]
+    # question ID -> {answer text: answer ID}
+    answer_ids_by_text: Dict[Any, Dict[Any, Any]]
+
+
+# Result for empty answers, which are never scanned
+_EMPTY_ANALYSIS = TextAnalysis(False, False, (), 0, 0)
+
+
+def _compile_keywords(keywords: List[str]) -> "re.Pattern[str]":
+    """
+    Compile a keyword list into one alternation pattern.
+
+    pattern.search(text) is equivalent to any(keyword in text for keyword in keywords),
+    but scans the text once in C instead of once per keyword.
+    """
+    return re.compile("|".join(re.escape(keyword) for keyword in keywords))
+
 
 class ResponseProcessor:
     """
@@ -41,10 +75,8 @@ class ResponseProcessor:
             return None
 
         try:
-            # Canvas uses ISO 8601 format with 'Z' suffix for UTC
-            # Python's fromisoformat doesn't handle 'Z', so replace with '+00:00'
-            if datetime_str.endswith('Z'):
-                datetime_str = datetime_str[:-1] + '+00:00'
+            # Canvas uses ISO 8601 format with 'Z' suffix for UTC, which
+            # fromisoformat parses directly on Python 3.11+ (see runtime.txt)
             return datetime.fromisoformat(datetime_str)
         except (ValueError, AttributeError):
             # Fallback: try without timezone
@@ -82,6 +114,11 @@ class ResponseProcessor:
         ]
     }
 
+    # (category, keywords) pairs as tuples for the categorization loop
+    CATEGORY_ITEMS = tuple(
+        (category, tuple(keywords)) for category, keywords in CATEGORY_KEYWORDS.items()
+    )
+
     # Critical issue keywords
     CRITICAL_KEYWORDS = [
         "broken", "crash", "cannot access", "can't access", "won't load",
@@ -124,6 +161,18 @@ class ResponseProcessor:
         ]
     }
 
+    # Sentiment indicator words (counted, not just detected)
+    POSITIVE_WORDS = ["good", "great", "excellent", "helpful", "clear", "easy", "love", "enjoy"]
+    NEGATIVE_WORDS = ["bad", "poor", "difficult", "hard", "confusing", "unclear", "hate", "dislike"]
+
+    # Keyword lists compiled once at class load (shared by all instances)
+    CRITICAL_PATTERN = _compile_keywords(CRITICAL_KEYWORDS)
+    SUGGESTION_PATTERN = _compile_keywords(SUGGESTION_KEYWORDS)
+    THEME_PATTERNS = {
+        theme: _compile_keywords(keywords)
+        for theme, keywords in THEME_KEYWORDS.items()
+    }
+
     def categorize_question(self, question_text: str, question_type: str) -> str:
         """
         Categorize a question based on its text and type.
@@ -141,21 +190,9 @@ class ResponseProcessor:
             >>> processor.categorize_question("How would you rate the course content?", "multiple_choice")
             'course_content'
         """
-        text_lower = question_text.lower()
-
-        # Check each category's keywords
-        category_scores = {}
-        for category, keywords in self.CATEGORY_KEYWORDS.items():
-            score = sum(1 for keyword in keywords if keyword in text_lower)
-            if score > 0:
-                category_scores[category] = score
-
-        # Return category with highest score
-        if category_scores:
-            return max(category_scores, key=category_scores.get)
-
-        # Default to 'other' if no match
-        return "other"
+        # The same few questions repeat for every student in a quiz, so the
+        # keyword scan is memoized on the lowercased text (type is unused)
+        return _categorize_cached(question_text.lower())
 
     def analyze_text_response(self, response_text: Optional[str]) -> Dict[str, Any]:
         """
@@ -187,35 +224,46 @@ class ResponseProcessor:
                 "sentiment_indicators": {}
             }
 
-        text_lower = response_text.lower()
-
-        # Critical issue detection
-        is_critical = any(keyword in text_lower for keyword in self.CRITICAL_KEYWORDS)
+        # Identical answers ("Excellent", "Yes") repeat across students, so
+        # the keyword scan is memoized on the lowercased text
+        analysis = _analyze_cached(response_text.lower())
 
-        # Improvement suggestion detection
-        has_suggestion = any(keyword in text_lower for keyword in self.SUGGESTION_KEYWORDS)
+        return {
+            "is_critical_issue": analysis.is_critical,
+            "contains_improvement_suggestion": analysis.has_suggestion,
+            "detected_themes": list(analysis.themes),
+            "sentiment_indicators": {
+                "positive_count": analysis.positive_count,
+                "negative_count": analysis.negative_count
+            }
+        }
 
-        # Theme detection
-        detected_themes = []
-        for theme, keywords in self.THEME_KEYWORDS.items():
-            if any(keyword in text_lower for keyword in keywords):
-                detected_themes.append(theme)
+    @staticmethod
+    def build_question_index(questions: List[Dict[str, Any]]) -> QuestionIndex:
+        """
+        Build the question lookups used by the parse_* methods.
 
-        # Basic sentiment indicators (count positive/negative words)
-        positive_words = ["good", "great", "excellent", "helpful", "clear", "easy", "love", "enjoy"]
-        negative_words = ["bad", "poor", "difficult", "hard", "confusing", "unclear", "hate", "dislike"]
+        Build once per quiz and pass it to every parse_submission or
+        parse_csv_student_response call for that quiz's students.
 
-        sentiment_indicators = {
-            "positive_count": sum(1 for word in positive_words if word in text_lower),
-            "negative_count": sum(1 for word in negative_words if word in text_lower)
-        }
+        Args:
+            questions: List of Canvas QuizQuestion dicts
 
-        return {
-            "is_critical_issue": is_critical,
-            "contains_improvement_suggestion": has_suggestion,
-            "detected_themes": detected_themes,
-            "sentiment_indicators": sentiment_indicators
-        }
+        Returns:
+            QuestionIndex of question ID -> question dict and
+            question ID -> answer text -> answer ID
+        """
+        questions_by_id = {}
+        answer_ids_by_text = {}
+        for q in questions:
+            questions_by_id[q['id']] = q
+            # First answer wins for duplicate texts (matches a linear scan)
+            answer_text_to_id = {}
+            for ans in q.get('answers') or ():
+                answer_text_to_id.setdefault(ans.get('text'), ans.get('id'))
+            answer_ids_by_text[q['id']] = answer_text_to_id
+
+        return QuestionIndex(questions_by_id, answer_ids_by_text)
 
     def extract_response_data(self, submission: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
@@ -253,24 +301,90 @@ class ResponseProcessor:
 
             if isinstance(data, list):
                 # Normalize quiz_submission_questions structure to match expected format
-                for item in data:
-                    if isinstance(item, dict):
-                        # Canvas Quiz Submission Questions API structure
-                        normalized = {
-                            'question_id': item.get('id'),  # Note: 'id' field is the question_id
-                            'answer': item.get('answer'),
-                            'flagged': item.get('flagged', False)
-                        }
-                        submission_data.append(normalized)
+                # (Canvas Quiz Submission Questions API items; non-dicts are dropped)
+                submission_data = [
+                    {
+                        'question_id': item.get('id'),  # Note: 'id' field is the question_id
+                        'answer': item.get('answer'),
+                        'flagged': item.get('flagged', False)
+                    }
+                    for item in data
+                    if isinstance(item, dict)
+                ]
             else:
-                print(f"Warning: submission_data is not a list: {type(data)}")
+                logger.warning("submission_data is not a list: %s", type(data))
 
         return submission_data
 
+    @staticmethod
+    def index_statistics(
+        quiz_statistics: Dict[str, Any]
+    ) -> List[Tuple[int, Dict[Any, Tuple[Optional[str], Optional[str]]]]]:
+        """
+        Invert Quiz Statistics API data into per-question user answer maps.
+
+        The statistics payload lists user_ids under each answer. Walking it
+        once and keying by user turns every later per-student lookup into a
+        dict hit. Build once per quiz and pass it to each
+        extract_answers_from_statistics call for that quiz's students.
+
+        Args:
+            quiz_statistics: Quiz statistics dict from Canvas API
+
+        Returns:
+            List of (question_id, {user_id: (answer, text)}) in question order
+        """
+        statistics_index = []
+
+        # Get question_statistics array
+        quiz_stats_list = quiz_statistics.get('quiz_statistics', [])
+        if not quiz_stats_list:
+            return statistics_index
+
+        question_statistics = quiz_stats_list[0].get('question_statistics', [])
+
+        for q_stat in question_statistics:
+            question_id = int(q_stat.get('id'))
+            question_type = q_stat.get('question_type')
+            user_answers = {}
+
+            # Handle multiple choice / true_false / multiple_answers questions
+            if question_type in ['multiple_choice_question', 'true_false_question', 'multiple_answers_question']:
+                # A user's first listed answer wins (setdefault keeps it)
+                for answer in q_stat.get('answers', []):
+                    answer_value = (str(answer.get('id')), answer.get('text', ''))
+                    for answer_user_id in answer.get('user_ids') or ():
+                        user_answers.setdefault(answer_user_id, answer_value)
+
+            # Handle essay / short_answer questions
+            elif question_type in ['essay_question', 'short_answer_question']:
+                # LIMITATION: Canvas Statistics API does NOT provide essay text responses
+                # It only shows which user_ids submitted responses, not the actual text
+                # Essay text is only available via Quiz Reports CSV API (see
+                # CanvasQuizReportsClient), so responders are recorded without
+                # text (NULL in database)
+                for answer in q_stat.get('answers', []):
+                    for answer_user_id in answer.get('user_ids') or ():
+                        user_answers[answer_user_id] = (None, None)
+
+            # Handle numerical questions
+            elif question_type == 'numerical_question':
+                for response in q_stat.get('responses', []):
+                    value = str(response.get('value', ''))
+                    user_answers.setdefault(response.get('user_id'), (value, value))
+
+            else:
+                continue
+
+            statistics_index.append((question_id, user_answers))
+
+        return statistics_index
+
     def extract_answers_from_statistics(
         self,
         user_id: int,
-        quiz_statistics: Dict[str, Any]
+        quiz_statistics: Dict[str, Any],
+        statistics_index: Optional[List[Tuple[int, Dict[Any, Tuple[Optional[str], Optional[str]]]]]] = None
     ) -> List[Dict[str, Any]]:
         """
         Extract individual student answers from Quiz Statistics API data.
@@ -281,6 +395,8 @@ class ResponseProcessor:
         Args:
             user_id: Canvas user_id of the student
             quiz_statistics: Quiz statistics dict from Canvas API
+            statistics_index: Optional prebuilt index from index_statistics
+                (pass when extracting answers for many students of the same quiz)
 
         Returns:
             List of answer dictionaries in submission_data format:
@@ -301,85 +417,34 @@ class ResponseProcessor:
         Example:
             >>> stats = quizzes_client.get_statistics(course_id=42, quiz_id=481)
             >>> processor = ResponseProcessor()
-            >>> answers = processor.extract_answers_from_statistics(user_id=626, quiz_statistics=stats)
+            >>> index = processor.index_statistics(stats)
+            >>> answers = processor.extract_answers_from_statistics(
+            ...     user_id=626, quiz_statistics=stats, statistics_index=index
+            ... )
             >>> len(answers)
             5
         """
-        student_answers = []
-
-        # Get question_statistics array
-        quiz_stats_list = quiz_statistics.get('quiz_statistics', [])
-        if not quiz_stats_list:
-            return student_answers
-
-        question_statistics = quiz_stats_list[0].get('question_statistics', [])
-
-        for q_stat in question_statistics:
-            question_id = int(q_stat.get('id'))
-            question_type = q_stat.get('question_type')
+        if statistics_index is None:
+            statistics_index = self.index_statistics(quiz_statistics)
 
-            # Handle multiple choice / true_false / multiple_answers questions
-            if question_type in ['multiple_choice_question', 'true_false_question', 'multiple_answers_question']:
-                answers_list = q_stat.get('answers', [])
-
-                # Find which answer this user selected
-                for answer in answers_list:
-                    user_ids = answer.get('user_ids', [])
-
-                    if user_id in user_ids:
-                        student_answers.append({
-                            'question_id': question_id,
-                            'answer': str(answer.get('id')),  # answer_id
-                            'text': answer.get('text', '')  # answer text
-                        })
-                        break  # Found this user's answer
-
-            # Handle essay / short_answer questions
-            elif question_type in ['essay_question', 'short_answer_question']:
-                # LIMITATION: Canvas Statistics API does NOT provide essay text responses
-                # It only shows which user_ids submitted responses, not the actual text
-                # Essay text is only available via Quiz Reports CSV API
-
-                # Check if this user responded (present in any answer's user_ids)
-                answers_list = q_stat.get('answers', [])
-                user_responded = False
-
-                for answer in answers_list:
-                    user_ids = answer.get('user_ids', [])
-                    if user_id in user_ids:
-                        user_responded = True
-                        break
-
-                if user_responded:
-                    # Record that user answered, but without text (NULL in database)
-                    # NOTE: Statistics API does not provide essay text for survey quizzes
-                    # Use Quiz Reports CSV workflow instead (see CanvasQuizReportsClient)
-                    student_answers.append({
-                        'question_id': question_id,
-                        'answer': None,  # Essay text not available via Statistics API
-                        'text': None
-                    })
+        student_answers = []
 
-            # Handle numerical questions
-            elif question_type == 'numerical_question':
-                responses = q_stat.get('responses', [])
-
-                # Find this user's numeric response
-                for response in responses:
-                    if response.get('user_id') == user_id:
-                        student_answers.append({
-                            'question_id': question_id,
-                            'answer': str(response.get('value', '')),
-                            'text': str(response.get('value', ''))
-                        })
-                        break
+        for question_id, user_answers in statistics_index:
+            answer = user_answers.get(user_id)
+            if answer is not None:
+                student_answers.append({
+                    'question_id': question_id,
+                    'answer': answer[0],
+                    'text': answer[1]
+                })
 
         return student_answers
 
     def parse_csv_student_response(
         self,
         csv_student_data: Dict[str, Any],
-        questions: List[Dict[str, Any]]
+        questions: List[Dict[str, Any]],
+        question_index: Optional[QuestionIndex] = None
     ) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
         """
         Parse student response data from Quiz Reports CSV into structured feedback.
@@ -406,6 +471,8 @@ class ResponseProcessor:
                     ]
                 }
             questions: List of Canvas QuizQuestion dicts for metadata enrichment
+            question_index: Optional prebuilt index from build_question_index
+                (pass when parsing many students of the same quiz)
 
         Returns:
             Tuple of (submission_metadata, parsed_responses)
@@ -420,8 +487,9 @@ class ResponseProcessor:
             >>> responses[0]['response_text']
             'The case study module was great...'
         """
-        # Create question lookup by ID
-        question_lookup = {q['id']: q for q in questions}
+        # Index questions by ID unless the caller built one per quiz
+        if question_index is None:
+            question_index = self.build_question_index(questions)
 
         # Build submission metadata
         # Note: CSV doesn't provide timing/score data - only answers
@@ -443,7 +511,7 @@ class ResponseProcessor:
 
         for response_data in csv_student_data.get('responses', []):
             question_id = response_data.get('question_id')
-            question = question_lookup.get(question_id, {})
+            question = question_index.questions_by_id.get(question_id, {})
 
             question_text = response_data.get('question_text') or question.get('question_text', '')
             question_type = question.get('question_type', '')
@@ -468,17 +536,18 @@ class ResponseProcessor:
             elif question_type in ['multiple_choice_question', 'true_false_question']:
                 # CSV contains answer text, not ID
                 selected_answer_text = answer_value
-                # Try to find answer ID from question's answers
-                for ans in question.get('answers', []):
-                    if ans.get('text') == answer_value:
-                        selected_answer_id = ans.get('id')
-                        break
+                # Find answer ID from the question's prebuilt text -> ID map
+                answer_text_to_id = question_index.answer_ids_by_text.get(question_id)
+                if answer_text_to_id:
+                    selected_answer_id = answer_text_to_id.get(answer_value)
             else:
                 # Default: store as text
                 response_text = str(answer_value) if answer_value else None
 
-            # Analyze text response
-            analysis = self.analyze_text_response(response_text or selected_answer_text)
+            # Analyze text response: lowercase once and use the memoized scan
+            # directly (analyze_text_response would rebuild a dict per answer)
+            answer_text = response_text or selected_answer_text
+            analysis = _analyze_cached(answer_text.lower()) if answer_text else _EMPTY_ANALYSIS
 
             parsed_response = {
                 "canvas_question_id": question_id,
@@ -491,8 +560,9 @@ class ResponseProcessor:
                 "selected_answer_text": selected_answer_text,
                 "selected_answer_id": selected_answer_id,
                 "question_category": category,
-                "contains_improvement_suggestion": analysis["contains_improvement_suggestion"],
-                "is_critical_issue": analysis["is_critical_issue"],
+                "contains_improvement_suggestion": analysis.has_suggestion,
+                "is_critical_issue": analysis.is_critical,
+                "detected_themes": list(analysis.themes),
             }
 
             parsed_responses.append(parsed_response)
@@ -502,7 +572,8 @@ class ResponseProcessor:
     def parse_submission(
         self,
         submission: Dict[str, Any],
-        questions: List[Dict[str, Any]]
+        questions: List[Dict[str, Any]],
+        question_index: Optional[QuestionIndex] = None
     ) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
         """
         Parse a Canvas submission into structured feedback data.
@@ -513,6 +584,8 @@ class ResponseProcessor:
         Args:
             submission: Canvas QuizSubmission dict from API
             questions: List of Canvas QuizQuestion dicts from API
+            question_index: Optional prebuilt index from build_question_index
+                (pass when parsing many submissions of the same quiz)
 
         Returns:
             Tuple of (submission_metadata, parsed_responses)
@@ -527,8 +600,9 @@ class ResponseProcessor:
             >>> responses[0]['question_category']
             'course_content'
         """
-        # Create question lookup by ID
-        question_lookup = {q['id']: q for q in questions}
+        # Index questions by ID unless the caller built one per quiz
+        if question_index is None:
+            question_index = self.build_question_index(questions)
 
         # Extract submission metadata with datetime parsing
         submission_metadata = {
@@ -551,11 +625,11 @@ class ResponseProcessor:
         for answer_data in submission_data:
             # Skip if answer_data is not a dict
             if not isinstance(answer_data, dict):
-                print(f"Warning: Skipping non-dict answer_data: {type(answer_data)}: {answer_data}")
+                logger.warning("Skipping non-dict answer_data: %s: %s", type(answer_data), answer_data)
                 continue
 
             question_id = answer_data.get('question_id')
-            question = question_lookup.get(question_id, {})
+            question = question_index.questions_by_id.get(question_id, {})
 
             question_text = question.get('question_text', '')
             question_type = question.get('question_type', '')
@@ -588,8 +662,10 @@ class ResponseProcessor:
                 # Default: store as text
                 response_text = str(answer_value) if answer_value else None
 
-            # Analyze text response
-            analysis = self.analyze_text_response(response_text or selected_answer_text)
+            # Analyze text response: lowercase once and use the memoized scan
+            # directly (analyze_text_response would rebuild a dict per answer)
+            answer_text = response_text or selected_answer_text
+            analysis = _analyze_cached(answer_text.lower()) if answer_text else _EMPTY_ANALYSIS
 
             parsed_response = {
                 "canvas_question_id": question_id,
@@ -602,8 +678,9 @@ class ResponseProcessor:
                 "selected_answer_text": selected_answer_text,
                 "selected_answer_id": selected_answer_id,
                 "question_category": category,
-                "contains_improvement_suggestion": analysis["contains_improvement_suggestion"],
-                "is_critical_issue": analysis["is_critical_issue"],
+                "contains_improvement_suggestion": analysis.has_suggestion,
+                "is_critical_issue": analysis.is_critical,
+                "detected_themes": list(analysis.themes),
             }
 
             parsed_responses.append(parsed_response)
@@ -611,6 +688,60 @@ class ResponseProcessor:
         return submission_metadata, parsed_responses
 
 
+@lru_cache(maxsize=4096)
+def _categorize_cached(text_lower: str) -> str:
+    """Score lowercased question text against each category's keywords."""
+    # Track the highest-scoring category as we go; strict > keeps the
+    # earliest category on ties. Default to 'other' if nothing matches
+    best_category = "other"
+    best_score = 0
+    for category, keywords in ResponseProcessor.CATEGORY_ITEMS:
+        score = 0
+        for keyword in keywords:
+            if keyword in text_lower:
+                score += 1
+        if score > best_score:
+            best_category = category
+            best_score = score
+
+    return best_category
+
+
+@lru_cache(maxsize=8192)
+def _analyze_cached(text_lower: str) -> TextAnalysis:
+    """Scan lowercased response text for issues, suggestions, themes, and sentiment."""
+    processor = ResponseProcessor
+
+    # Critical issue detection
+    is_critical = processor.CRITICAL_PATTERN.search(text_lower) is not None
+
+    # Improvement suggestion detection
+    has_suggestion = processor.SUGGESTION_PATTERN.search(text_lower) is not None
+
+    # Theme detection
+    detected_themes = tuple(
+        theme for theme, pattern in processor.THEME_PATTERNS.items()
+        if pattern.search(text_lower)
+    )
+
+    # Basic sentiment indicators (count positive/negative words)
+    positive_count = sum(1 for word in processor.POSITIVE_WORDS if word in text_lower)
+    negative_count = sum(1 for word in processor.NEGATIVE_WORDS if word in text_lower)
+
+    return TextAnalysis(is_critical, has_suggestion, detected_themes, positive_count, negative_count)
+
+
+@lru_cache()
+def get_response_processor() -> ResponseProcessor:
+    """
+    Get the shared ResponseProcessor instance.
+
+    The processor holds no per-request state, so aggregation code reuses
+    one instance instead of constructing a new one per course.
+    """
+    return ResponseProcessor()
+
+
 # Testing
 if __name__ == "__main__":
     processor = ResponseProcessor()
@@ -12,11 +12,26 @@ Detection algorithm uses multiple signals:
 This service helps filter out regular quizzes/assignments from feedback surveys.
 """
 
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple
 from decimal import Decimal
 import re
 
 
+def _combine_patterns(patterns: List[str]) -> "re.Pattern[str]":
+    """
+    Compile a pattern list into one case-insensitive alternation.
+
+    A single search tells whether any listed pattern matches the title,
+    without a separate regex search per pattern.
+    """
+    return re.compile("|".join(f"(?:{pattern})" for pattern in patterns), re.IGNORECASE)
+
+
+def _compile_each(patterns: List[str]) -> Tuple["re.Pattern[str]", ...]:
+    """Compile each pattern on its own, in list order (case-insensitive)."""
+    return tuple(re.compile(pattern, re.IGNORECASE) for pattern in patterns)
+
+
 class SurveyDetector:
     """
     Service for identifying feedback surveys from Canvas quizzes.
@@ -81,6 +96,13 @@ class SurveyDetector:
         r'\bpractice\b',  # Practice quizzes
     ]
 
+    # Patterns compiled once at class load (shared by all instances): the
+    # combined pre-checks, plus each pattern alone to report which one matched
+    FEEDBACK_PATTERN = _combine_patterns(FEEDBACK_PATTERNS)
+    EXCLUSION_PATTERN = _combine_patterns(EXCLUSION_PATTERNS)
+    FEEDBACK_REGEXES = _compile_each(FEEDBACK_PATTERNS)
+    EXCLUSION_REGEXES = _compile_each(EXCLUSION_PATTERNS)
+
     def identify(self, quiz: Dict[str, Any]) -> Dict[str, Any]:
         """
         Identify if a Canvas quiz is a feedback survey.
@@ -114,25 +136,19 @@ class SurveyDetector:
         points = quiz.get('points_possible', 0)
         published = quiz.get('published', False)
 
-        confidence_score = Decimal('0.0')
+        # Accumulate in integer hundredths; converted to Decimal once at the end
+        confidence_points = 0
         reasons = []
         signals = {}
 
-        # Signal 1: Title pattern matching (HIGH CONFIDENCE: +0.60)
-        title_match = self._check_title_patterns(title)
-        if title_match['matches']:
-            confidence_score += Decimal('0.60')
-            reasons.append(f"Title matches feedback survey pattern: '{title_match['pattern']}'")
-            signals['title_match'] = True
-            signals['title_pattern'] = title_match['pattern']
-        else:
-            signals['title_match'] = False
-
-        # Signal 2: Exclusion patterns (DISQUALIFIER: -1.00)
+        # Signal 1: Exclusion patterns (DISQUALIFIER: -1.00)
+        # Checked first: an excluded title needs no further signals
         exclusion_match = self._check_exclusion_patterns(title)
         if exclusion_match['matches']:
-            confidence_score = Decimal('0.0')
+            confidence_score = Decimal(0).scaleb(-2)
             reasons = [f"Title matches exclusion pattern: '{exclusion_match['pattern']}' (NOT a feedback survey)"]
+            # Title patterns are not evaluated for excluded titles
+            signals['title_match'] = None
             signals['excluded'] = True
             signals['exclusion_pattern'] = exclusion_match['pattern']
 
@@ -143,11 +159,21 @@ class SurveyDetector:
                 "signals": signals
             }
 
+        # Signal 2: Title pattern matching (HIGH CONFIDENCE: +0.60)
+        title_match = self._check_title_patterns(title)
+        if title_match['matches']:
+            confidence_points += 60
+            reasons.append(f"Title matches feedback survey pattern: '{title_match['pattern']}'")
+            signals['title_match'] = True
+            signals['title_pattern'] = title_match['pattern']
+        else:
+            signals['title_match'] = False
+
         signals['excluded'] = False
 
         # Signal 3: Canvas quiz_type is 'survey' or 'graded_survey' (HIGH CONFIDENCE: +0.30)
         if quiz_type in ['survey', 'graded_survey']:
-            confidence_score += Decimal('0.30')
+            confidence_points += 30
             reasons.append(f"Canvas quiz_type is '{quiz_type}'")
             signals['is_canvas_survey_type'] = True
         else:
@@ -155,7 +181,7 @@ class SurveyDetector:
 
         # Signal 4: Anonymous submissions (MEDIUM CONFIDENCE: +0.15)
         if anonymous:
-            confidence_score += Decimal('0.15')
+            confidence_points += 15
             reasons.append("Quiz allows anonymous submissions")
             signals['is_anonymous'] = True
         else:
@@ -163,17 +189,18 @@ class SurveyDetector:
 
         # Signal 5: Ungraded (0 points) (MEDIUM CONFIDENCE: +0.10)
         if points == 0:
-            confidence_score += Decimal('0.10')
+            confidence_points += 10
             reasons.append("Quiz is ungraded (0 points)")
             signals['is_ungraded'] = True
         else:
             signals['is_ungraded'] = False
 
         # Cap confidence score at 1.00
-        confidence_score = min(confidence_score, Decimal('1.00'))
+        confidence_points = min(confidence_points, 100)
+        confidence_score = Decimal(confidence_points).scaleb(-2)
 
         # Determine if it's likely a survey (confidence >= 0.50)
-        is_survey = confidence_score >= Decimal('0.50')
+        is_survey = confidence_points >= 50
 
         return {
             "is_survey": is_survey,
@@ -192,9 +219,12 @@ class SurveyDetector:
         Returns:
             {"matches": bool, "pattern": str}
         """
-        for pattern in self.FEEDBACK_PATTERNS:
-            if re.search(pattern, title, re.IGNORECASE):
-                return {"matches": True, "pattern": pattern}
+        # Most quiz titles match nothing: one combined search rules them out.
+        # On a hit, report the first listed pattern that matches
+        if self.FEEDBACK_PATTERN.search(title):
+            for regex in self.FEEDBACK_REGEXES:
+                if regex.search(title):
+                    return {"matches": True, "pattern": regex.pattern}
 
         return {"matches": False, "pattern": None}
 
@@ -208,9 +238,11 @@ class SurveyDetector:
         Returns:
             {"matches": bool, "pattern": str}
         """
-        for pattern in self.EXCLUSION_PATTERNS:
-            if re.search(pattern, title, re.IGNORECASE):
-                return {"matches": True, "pattern": pattern}
+        # Same combined pre-check as _check_title_patterns
+        if self.EXCLUSION_PATTERN.search(title):
+            for regex in self.EXCLUSION_REGEXES:
+                if regex.search(title):
+                    return {"matches": True, "pattern": regex.pattern}
 
         return {"matches": False, "pattern": None}
 
@@ -266,13 +298,14 @@ class SurveyDetector:
             >>> all_quizzes = [{...}, {...}, ...]
             >>> surveys_only = detector.filter_surveys(all_quizzes, min_confidence=Decimal('0.70'))
         """
-        identified = self.identify_batch(quizzes)
+        surveys = []
+
+        for quiz in quizzes:
+            result = self.identify(quiz)
 
-        surveys = [
-            quiz for quiz in identified
-            if quiz['survey_detection']['is_survey'] and
-            quiz['survey_detection']['confidence'] >= min_confidence
-        ]
+            # Only survivors get the combined dict; most quizzes are dropped
+            if result['is_survey'] and result['confidence'] >= min_confidence:
+                surveys.append({**quiz, "survey_detection": result})
 
         return surveys
 